@@ -0,0 +1,153 @@
+import os
+import sys
+
+# Every case runs against the offline fake model, never a live endpoint
+os.environ["LLM_PROVIDER"] = "fake"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from typing import Dict, List
+from benchmarks.harness import Benchmark
+
+QUERIES = ["quantum computing", "machine learning", "blockchain"]
+
+def _handoff_setup():
+    from examples.langgraph_handoff_example import create_handoff_graph
+    return create_handoff_graph()
+
+def _handoff_run(app, i: int):
+    query = QUERIES[i % len(QUERIES)]
+    return app.invoke({
+        "messages": [{"role": "user", "content": query}],
+        "current_agent": "research",
+        "task_type": "research_analysis_report",
+        "handoff_reason": "Initial request",
+        "final_result": "",
+    })
+
+def _swarm_setup():
+    from langgraph.checkpoint.memory import InMemorySaver
+    from examples.langgraph_swarm_example import swarm
+    return swarm.build(default_active_agent="Alice").compile(checkpointer=InMemorySaver())
+
+LONG_THREAD_TURNS = 50
+
+def _swarm_long_thread_setup():
+    app = _swarm_setup()
+    config = {"configurable": {"thread_id": "bench_long"}}
+    for i in range(LONG_THREAD_TURNS):
+        app.invoke({"messages": [{"role": "user", "content": f"Turn {i}: what's 5 + 7?"}]}, config)
+    return app
+
+def _swarm_long_thread_run(app, i: int):
+    # Keeps extending the same thread: measures turn 50+ against swarm_turn's turn 1
+    config = {"configurable": {"thread_id": "bench_long"}}
+    return app.invoke({"messages": [{"role": "user", "content": "What's 5 + 7?"}]}, config)
+
+def _swarm_sqlite_setup():
+    import tempfile
+    from examples.langgraph_swarm_example import swarm
+    from utils.sqlite_checkpointer import SQLiteCheckpointer
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite")
+    return swarm.build(default_active_agent="Alice").compile(checkpointer=SQLiteCheckpointer(path))
+
+def _swarm_run(app, i: int):
+    # Fresh thread per iteration so history does not grow across runs
+    config = {"configurable": {"thread_id": f"bench_{i}"}}
+    return app.invoke({"messages": [{"role": "user", "content": "What's 5 + 7?"}]}, config)
+
+def _react_setup():
+    from langchain.agents import create_react_agent, AgentExecutor
+    from langchain_core.prompts import PromptTemplate
+    from llm.fake import get_fake_client
+    from examples.react_agent_example import REACT_PROMPT_TEMPLATE, get_current_time, calculate_math
+
+    # One tool step, then a final answer once an observation is in the scratchpad
+    llm = get_fake_client(
+        rules=[(r"Observation:", "Thought: I now know the final answer\nFinal Answer: 387")],
+        default_response="Thought: I should calculate\nAction: calculate_math\nAction Input: 15 * 23 + 42",
+    )
+    tools = [get_current_time, calculate_math]
+    agent = create_react_agent(llm, tools, PromptTemplate.from_template(REACT_PROMPT_TEMPLATE))
+    return AgentExecutor(agent=agent, tools=tools, handle_parsing_errors=True, max_iterations=5)
+
+def _react_run(agent_executor, i: int):
+    return agent_executor.invoke({"input": "Calculate 15 * 23 + 42"})
+
+def _model_definition(i: int = 0):
+    from utils.DynamicModelBuilder import ModelDefinition
+    return ModelDefinition(
+        model_name=f"ProductInfo{i}",
+        fields=[
+            {"name": "product_name", "type": "string", "description": "Name of the product"},
+            {"name": "price", "type": "float", "description": "Price of the product"},
+            {"name": "categories", "type": "list_string", "description": "Product categories",
+             "required": False, "default_value": []},
+        ],
+    )
+
+def _dynamic_model_cached_run(model_def, i: int):
+    from utils.DynamicModelBuilder import DynamicModelBuilder
+    return DynamicModelBuilder.create_pydantic_model(model_def)
+
+def _dynamic_model_cold_run(model_def, i: int):
+    from utils.DynamicModelBuilder import DynamicModelBuilder
+    DynamicModelBuilder.clear_cache()
+    return DynamicModelBuilder.create_pydantic_model(model_def)
+
+BATCH_SIZE = 1000
+
+def _validate_batch_setup():
+    import json
+    from utils.DynamicModelBuilder import DynamicModelBuilder
+    model = DynamicModelBuilder.create_pydantic_model(_model_definition())
+    records = [{"product_name": f"p{i}", "price": i * 1.5, "categories": ["a", "b"]} for i in range(BATCH_SIZE)]
+    return model, json.dumps(records).encode()
+
+def _validate_batch_run(state, i: int):
+    from utils.DynamicModelBuilder import DynamicModelBuilder
+    model, payload = state
+    return DynamicModelBuilder.validate_batch(model, payload)
+
+def _encryption_setup():
+    from utils.symmetric_encryption import SymmetricKeyEncryption
+    # Derive the key up front so the timed runs only measure encrypt/decrypt
+    encryptor = SymmetricKeyEncryption("benchmark_password")
+    encryptor.key
+    return encryptor
+
+def _encryption_roundtrip_run(encryptor, i: int):
+    return encryptor.decrypt_data(encryptor.encrypt_data("sk-" + "x" * 48))
+
+def _key_derivation_run(state, i: int):
+    from utils.symmetric_encryption import SymmetricKeyEncryption, clear_key_cache
+    clear_key_cache()
+    # Fresh instance and empty cache: pays the full PBKDF2 cost
+    return SymmetricKeyEncryption("benchmark_password").key
+
+CASES: Dict[str, Benchmark] = {
+    benchmark.name: benchmark for benchmark in [
+        Benchmark("handoff_graph", _handoff_run, _handoff_setup,
+                  description="create_handoff_graph research -> analysis -> writing run"),
+        Benchmark("swarm_turn", _swarm_run, _swarm_setup,
+                  description="One user turn through the Alice/Bob swarm with InMemorySaver"),
+        Benchmark("swarm_long_thread", _swarm_long_thread_run, _swarm_long_thread_setup,
+                  description=f"One swarm turn on a thread already {LONG_THREAD_TURNS} turns long"),
+        Benchmark("swarm_turn_sqlite", _swarm_run, _swarm_sqlite_setup,
+                  description="One user turn through the Alice/Bob swarm with SQLiteCheckpointer"),
+        Benchmark("react_agent", _react_run, _react_setup,
+                  description="ReAct AgentExecutor: one tool step and a final answer"),
+        Benchmark("dynamic_model_cached", _dynamic_model_cached_run, _model_definition,
+                  description="DynamicModelBuilder.create_pydantic_model with a warm cache"),
+        Benchmark("dynamic_model_cold", _dynamic_model_cold_run, _model_definition,
+                  description="DynamicModelBuilder.create_pydantic_model after clearing the cache"),
+        Benchmark("validate_batch", _validate_batch_run, _validate_batch_setup, ops=BATCH_SIZE,
+                  description=f"validate_batch over a {BATCH_SIZE}-record JSON array"),
+        Benchmark("encryption_roundtrip", _encryption_roundtrip_run, _encryption_setup, ops=2,
+                  description="SymmetricKeyEncryption encrypt + decrypt of an API-key-sized string"),
+        Benchmark("key_derivation", _key_derivation_run,
+                  description="SymmetricKeyEncryption construction with a cold key cache"),
+    ]
+}
+
+def case_names() -> List[str]:
+    return list(CASES)
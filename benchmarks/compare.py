@@ -0,0 +1,62 @@
+"""
+Compare two result files from benchmarks.run and flag regressions.
+
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json --threshold 0.10
+
+Exits with status 1 when any case's p50 or p95 latency got worse by more
+than the threshold, so it can gate a dependency upgrade in CI.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_ops_s", "peak_rss_kb", "traced_peak_bytes")
+# Latency metrics that fail the comparison when they regress past the threshold
+GATED = ("p50_ms", "p95_ms")
+
+def compare(old: dict, new: dict, threshold: float):
+    rows, regressions = [], []
+    for name, new_result in new["results"].items():
+        old_result = old["results"].get(name)
+        if not old_result or "p50_ms" not in old_result or "p50_ms" not in new_result:
+            continue
+        for metric in METRICS:
+            before, after = old_result[metric], new_result[metric]
+            change = (after - before) / before if before else 0.0
+            rows.append((name, metric, before, after, change))
+            if metric in GATED and change > threshold:
+                regressions.append((name, metric, change))
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative latency increase that counts as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    old_packages, new_packages = old["environment"]["packages"], new["environment"]["packages"]
+    for package in sorted(set(old_packages) | set(new_packages)):
+        if old_packages.get(package) != new_packages.get(package):
+            print(f"📦 {package}: {old_packages.get(package)} -> {new_packages.get(package)}")
+
+    rows, regressions = compare(old, new, args.threshold)
+    print(f"{'case':<24}{'metric':<20}{'old':>14}{'new':>14}{'change':>10}")
+    for name, metric, before, after, change in rows:
+        print(f"{name:<24}{metric:<20}{before:>14.3f}{after:>14.3f}{change:>+10.1%}")
+
+    if regressions:
+        print("\n❌ Regressions:")
+        for name, metric, change in regressions:
+            print(f"  - {name} {metric}: {change:+.1%}")
+        sys.exit(1)
+    print("\n✅ No regressions above threshold")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import gc
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional
+
+# Packages whose versions are recorded with every result file
+TRACKED_PACKAGES = ("langchain", "langchain-core", "langgraph", "langgraph-swarm", "pydantic", "cryptography")
+
+class Benchmark:
+    """
+    One benchmark case.
+
+    setup() runs once and returns the state passed to run(state, i) for every
+    iteration. ops is how many logical operations a single run() performs,
+    so throughput is reported in operations per second.
+    """
+
+    def __init__(self, name: str, run: Callable[[Any, int], Any], setup: Optional[Callable[[], Any]] = None,
+                 ops: int = 1, description: str = ""):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.ops = ops
+        self.description = description
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _peak_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+def measure(benchmark: Benchmark, iterations: int, warmup: int) -> Dict[str, Any]:
+    """
+    Time benchmark.run over iterations (after warmup runs), then repeat one
+    run under tracemalloc to record allocations without skewing the timings.
+    """
+    state = benchmark.setup() if benchmark.setup else None
+    for i in range(warmup):
+        benchmark.run(state, i)
+
+    gc.collect()
+    latencies = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        benchmark.run(state, warmup + i)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    benchmark.run(state, warmup + iterations)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated_blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+
+    latencies.sort()
+    return {
+        "description": benchmark.description,
+        "iterations": iterations,
+        "ops_per_iteration": benchmark.ops,
+        "throughput_ops_s": benchmark.ops * iterations / elapsed if elapsed else 0.0,
+        "mean_ms": 1000 * sum(latencies) / len(latencies),
+        "p50_ms": 1000 * _percentile(latencies, 0.50),
+        "p95_ms": 1000 * _percentile(latencies, 0.95),
+        "p99_ms": 1000 * _percentile(latencies, 0.99),
+        "max_ms": 1000 * latencies[-1],
+        "peak_rss_kb": _peak_rss_kb(),
+        "traced_peak_bytes": peak,
+        "retained_bytes": current,
+        "retained_blocks": allocated_blocks,
+    }
+
+def environment() -> Dict[str, Any]:
+    """Python, platform, git commit and tracked package versions for a result file."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    packages = {}
+    for name in TRACKED_PACKAGES:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "packages": packages,
+        "timestamp": time.time(),
+    }
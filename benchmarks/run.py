@@ -0,0 +1,90 @@
+"""
+Run the benchmark suite and write machine-readable results.
+
+    python -m benchmarks.run                      # all cases -> benchmarks/results/<commit>.json
+    python -m benchmarks.run --only swarm_turn,react_agent --iterations 200
+    python -m benchmarks.compare old.json new.json
+
+Each case runs in its own subprocess so peak RSS and import costs are per case.
+"""
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import environment, measure
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def run_case(name: str, iterations: int, warmup: int) -> dict:
+    """Run one case in this process; example output is silenced."""
+    from benchmarks.cases import CASES
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            return measure(CASES[name], iterations, warmup)
+        except ImportError as e:
+            return {"skipped": f"{type(e).__name__}: {e}"}
+
+def run_isolated(name: str, iterations: int, warmup: int) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--case", name,
+         "--iterations", str(iterations), "--warmup", str(warmup)],
+        capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main():
+    from benchmarks.cases import case_names
+
+    parser = argparse.ArgumentParser(description="Benchmark the examples/ workflows offline")
+    parser.add_argument("--only", help="Comma-separated case names (default: all)")
+    parser.add_argument("--iterations", "-n", type=int, default=50, help="Timed iterations per case")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed warmup iterations per case")
+    parser.add_argument("--output", "-o", help="Result file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--list", action="store_true", help="List case names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(case_names()))
+        return
+
+    if args.case:
+        # Child process mode: print one JSON line for the parent
+        print(json.dumps(run_case(args.case, args.iterations, args.warmup)))
+        return
+
+    names = args.only.split(",") if args.only else case_names()
+    unknown = set(names) - set(case_names())
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(sorted(unknown))}")
+
+    env = environment()
+    results = {}
+    for name in names:
+        print(f"▶ {name} ...", end=" ", flush=True)
+        results[name] = run_isolated(name, args.iterations, args.warmup)
+        result = results[name]
+        if "p50_ms" in result:
+            print(f"p50 {result['p50_ms']:.3f} ms, p99 {result['p99_ms']:.3f} ms, "
+                  f"{result['throughput_ops_s']:.1f} ops/s, peak RSS {result['peak_rss_kb'] / 1024:.1f} MB")
+        else:
+            print(result.get("skipped") or result.get("error"))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{(env['commit'] or 'local')[:12]}.json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"environment": env, "iterations": args.iterations, "results": results}, f, indent=2)
+    print(f"\n📄 Results written to {output}")
+
+if __name__ == "__main__":
+    main()
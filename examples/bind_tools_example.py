@@ -5,12 +5,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from llm.gemini import get_gemini_client
+from llm import get_client
+from utils.tool_cache import cached_tool
+from utils.tool_executor import ToolExecutor
+from utils.tool_loop import run_tool_loop
 import json
 from datetime import datetime
 
 # Define tools using @tool decorator
 @tool
+@cached_tool(ttl=600)
 def get_weather(location: str) -> str:
     """Get the current weather for a location."""
     # Mock weather data - in real app, you'd call a weather API
@@ -31,6 +35,7 @@ def calculate_tip(bill_amount: float, tip_percentage: float = 18.0) -> str:
     return f"Bill: ${bill_amount:.2f}, Tip ({tip_percentage}%): ${tip_amount:.2f}, Total: ${total:.2f}"
 
 @tool
+@cached_tool(ttl=3600)
 def convert_currency(amount: float, from_currency: str, to_currency: str) -> str:
     """Convert currency amounts (mock data)."""
     # Mock exchange rates - in real app, you'd use a currency API
@@ -57,7 +62,7 @@ def demonstrate_bind_tools():
     print("="*50)
     
     # Get the LLM
-    llm = get_gemini_client()
+    llm = get_client()
     
     # Case 1: Basic tool binding and execution
     print("\n📌 Case 1: Basic tool binding with execution")
@@ -72,16 +77,12 @@ def demonstrate_bind_tools():
     
     if response1.tool_calls:
         print("🛠️ Tool calls made:")
-        for tool_call in response1.tool_calls:
+        # Execute the tool calls concurrently, results come back in call order
+        with ToolExecutor(tools, timeout=30) as executor:
+            results = executor.execute(response1)
+        for tool_call, result in zip(response1.tool_calls, results):
             print(f"  - {tool_call['name']}: {tool_call['args']}")
-            
-            # Execute the tool call
-            if tool_call['name'] == 'get_weather':
-                result = get_weather.invoke(tool_call['args'])
-            elif tool_call['name'] == 'calculate_tip':
-                result = calculate_tip.invoke(tool_call['args'])
-            
-            print(f"    Result: {result}")
+            print(f"    Result: {result.content}")
     
     print("\n" + "-"*50)
     
@@ -116,34 +117,25 @@ def demonstrate_bind_tools():
     messages = []
     user_query = "What's the weather in London, then convert 100 USD to EUR"
     print(f"Query: {user_query}")
-    
     messages.append(HumanMessage(content=user_query))
-    response3 = llm_with_all_tools.invoke(messages)
-    messages.append(response3)
-    
-    print(f"Response: {response3.content}")
     
-    if response3.tool_calls:
-        print("🛠️ Tool calls in conversation:")
-        for tool_call in response3.tool_calls:
-            print(f"  - {tool_call['name']}: {tool_call['args']}")
-            
-            # Execute tools and add results to conversation
-            tool_result = None
-            if tool_call['name'] == 'get_weather':
-                tool_result = get_weather.invoke(tool_call['args'])
-            elif tool_call['name'] == 'convert_currency':
-                tool_result = convert_currency.invoke(tool_call['args'])
-            elif tool_call['name'] == 'calculate_tip':
-                tool_result = calculate_tip.invoke(tool_call['args'])
-            
-            print(f"    Result: {tool_result}")
-            
-            # Add tool result to conversation
-            messages.append(ToolMessage(
-                content=str(tool_result),
-                tool_call_id=tool_call['id']
-            ))
+    # Loop until the model answers: stream its reply, run tool calls, send results back
+    print("Response: ", end="", flush=True)
+    with ToolExecutor(all_tools, timeout=30) as executor:
+        result = run_tool_loop(
+            llm_with_all_tools,
+            messages,
+            executor,
+            max_steps=5,
+            on_token=lambda text: print(text, end="", flush=True),
+        )
+    print()
+    
+    print("🛠️ Tool calls in conversation:")
+    for message in result.messages:
+        if isinstance(message, ToolMessage):
+            print(f"  - {message.name}: {message.content}")
+    print(f"Steps: {result.steps}, stopped by: {result.stop_reason}")
 
 def main():
     print("🚀 Starting bind_tools Examples (3 Cases)")
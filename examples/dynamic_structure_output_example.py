@@ -5,6 +5,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # from llm.gemini import get_gemini_client
 from llm.deepseek import get_deepseek_client
+from llm.structured_cache import with_cached_structured_output, SQLiteCache
 from utils.DynamicModelBuilder import DynamicModelBuilder, ModelDefinition
 import json
 
@@ -59,9 +60,10 @@ def main():
         ]
     }
     
-    # JSON definition for QuantumExplanation model (simplified without nested objects)
+    # JSON definition for QuantumExplanation model, nesting QuantumConcept by reference
     quantum_explanation_model_json = {
         "model_name": "QuantumExplanation",
+        "definitions": [quantum_concept_model_json],
         "fields": [
             {
                 "name": "main_idea",
@@ -71,7 +73,8 @@ def main():
             },
             {
                 "name": "key_concepts",
-                "type": "list_string",
+                "type": "list_object",
+                "ref": "QuantumConcept",
                 "description": "List of key quantum computing concepts",
                 "required": True
             },
@@ -96,12 +99,15 @@ def main():
     # llm = get_gemini_client()
     llm = get_deepseek_client()
     
+    # Identical (model, schema, prompt) inputs are served from disk on later runs
+    cache = SQLiteCache()
+    
     print("=== Dynamic Country Information Model ===")
     print(f"Model name: {country_model_def.model_name}")
     print()
     
     # Structured output for country information
-    structured_llm = llm.with_structured_output(CountryInfo)
+    structured_llm = with_cached_structured_output(llm, CountryInfo, cache=cache)
     response = structured_llm.invoke("Tell me about France - its capital, population, and continent")
     print("LLM Response:")
     print(json.dumps(response.model_dump(), indent=2))
@@ -112,7 +118,7 @@ def main():
     print()
     
     # Structured output for quantum computing explanation
-    quantum_llm = llm.with_structured_output(QuantumExplanation)
+    quantum_llm = with_cached_structured_output(llm, QuantumExplanation, cache=cache)
     quantum_response = quantum_llm.invoke("Explain quantum computing in simple terms with key concepts and applications")
     print("LLM Response:")
     print(json.dumps(quantum_response.model_dump(), indent=2))
@@ -6,7 +6,9 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from langgraph.graph import StateGraph, END
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from llm.gemini import get_gemini_client
+from llm import get_client
+from utils.tool_cache import cached_tool
+from utils.instrumentation import InstrumentationHandler
 from typing import TypedDict, List, Literal
 import json
 
@@ -20,6 +22,7 @@ class HandoffState(TypedDict):
 
 # Define tools for different agents
 @tool
+@cached_tool(ttl=3600)
 def research_tool(query: str) -> str:
     """Research information about a topic."""
     # Simulated research - in real scenario, this could call APIs, databases, etc.
@@ -31,6 +34,7 @@ def research_tool(query: str) -> str:
     return research_data.get(query.lower(), f"No specific research data found for {query}")
 
 @tool
+@cached_tool(ttl=3600)
 def analysis_tool(data: str) -> str:
     """Analyze data and provide insights."""
     # Simulated analysis
@@ -165,17 +169,17 @@ def route_to_agent(state: HandoffState) -> Literal["research", "analysis", "writ
 
 # Node functions for the graph
 def research_node(state: HandoffState) -> HandoffState:
-    llm = get_gemini_client()
+    llm = get_client()
     agent = ResearchAgent(llm)
     return agent.process(state)
 
 def analysis_node(state: HandoffState) -> HandoffState:
-    llm = get_gemini_client()
+    llm = get_client()
     agent = AnalysisAgent(llm)
     return agent.process(state)
 
 def writing_node(state: HandoffState) -> HandoffState:
-    llm = get_gemini_client()
+    llm = get_client()
     agent = WritingAgent(llm)
     return agent.process(state)
 
@@ -228,6 +232,9 @@ def main():
     # Create the workflow
     app = create_handoff_graph()
     
+    # Records per-node and per-tool timings for every run
+    instrumentation = InstrumentationHandler(trace_path=".cache/traces/handoff.jsonl")
+    
     # Test queries
     queries = [
         "quantum computing",
@@ -251,7 +258,7 @@ def main():
         
         try:
             # Run the workflow
-            final_state = app.invoke(initial_state)
+            final_state = app.invoke(initial_state, {"callbacks": [instrumentation]})
             
             print(f"\n📋 Final Result:")
             print(final_state["final_result"])
@@ -265,6 +272,9 @@ def main():
             print(f"❌ Error: {str(e)}")
         
         print("\n" + "-"*60)
+    
+    print(f"\n⏱️ Timing summary: {json.dumps(instrumentation.summary(), indent=2)}")
+    instrumentation.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
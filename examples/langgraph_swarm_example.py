@@ -1,14 +1,18 @@
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from llm.gemini import get_gemini_client
+from llm import get_client
+from utils.instrumentation import InstrumentationHandler
+from utils.history_compaction import HistoryCompactor
+from utils.swarm_builder import SwarmBuilder
 
 from langgraph.checkpoint.memory import InMemorySaver
-from langgraph.prebuilt import create_react_agent
-from langgraph_swarm import create_handoff_tool, create_swarm
+from langgraph_swarm import create_handoff_tool
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+import json
 
-model = get_gemini_client()
+# Provider comes from LLM_PROVIDER (default gemini); "fake" runs fully offline
+model = get_client()
 
 def add(a: int, b: int) -> int:
     """Add two numbers"""
@@ -18,18 +22,22 @@ def multiply(a: int, b: int) -> int:
     """Multiply two numbers"""
     return a * b
 
-alice = create_react_agent(
-    model,
+# Shared by both agents: keeps each model call under ~2000 tokens of history
+# (older turns folded into a per-thread rolling summary, handoff chatter dropped)
+compactor = HistoryCompactor(model, max_tokens=2000)
+
+# Agents share the model, bind their tools once and are only compiled when
+# first needed (Bob on the first handoff to him)
+swarm = SwarmBuilder(model, pre_model_hook=compactor)
+swarm.add_agent(
+    "Alice",
+    "You are Alice, a math expert who can add and multiply numbers. Be helpful and friendly.",
     [add, multiply, create_handoff_tool(agent_name="Bob")],
-    prompt="You are Alice, a math expert who can add and multiply numbers. Be helpful and friendly.",
-    name="Alice",
 )
-
-bob = create_react_agent(
-    model,
+swarm.add_agent(
+    "Bob",
+    "You are Bob, you speak like a pirate and are great at storytelling. You cannot do math - always transfer math questions to Alice.",
     [create_handoff_tool(agent_name="Alice", description="Transfer to Alice, she can help with math")],
-    prompt="You are Bob, you speak like a pirate and are great at storytelling. You cannot do math - always transfer math questions to Alice.",
-    name="Bob",
 )
 
 def print_conversation(result, turn_name):
@@ -62,14 +70,20 @@ def main():
     print("🧮 Alice: Math expert (addition, multiplication)")
     print("🏴‍☠️ Bob: Pirate storyteller (transfers math to Alice)")
     
-    checkpointer = InMemorySaver()
-    workflow = create_swarm(
-        [alice, bob],
-        default_active_agent="Alice"
-    )
+    # SWARM_CHECKPOINT_DB keeps conversations on disk across restarts (compressed
+    # message deltas, newest 20 checkpoints per thread); unset keeps them in RAM
+    checkpoint_db = os.getenv("SWARM_CHECKPOINT_DB")
+    if checkpoint_db:
+        from utils.sqlite_checkpointer import SQLiteCheckpointer
+        checkpointer = SQLiteCheckpointer(checkpoint_db, keep_last=20)
+    else:
+        checkpointer = InMemorySaver()
+    workflow = swarm.build(default_active_agent="Alice")
     app = workflow.compile(checkpointer=checkpointer)
     
-    config = {"configurable": {"thread_id": "conversation_1"}}
+    # Records LLM, tool and per-agent node timings across all turns
+    instrumentation = InstrumentationHandler(trace_path=".cache/traces/swarm.jsonl")
+    config = {"configurable": {"thread_id": "conversation_1"}, "callbacks": [instrumentation]}
     
     # Conversation turns
     conversations = [
@@ -100,6 +114,11 @@ def main():
     print(f"   - Total turns: {len(conversations)}")
     print(f"   - Active agent: {result.get('active_agent', 'Unknown')}")
     print(f"   - Thread ID: {config['configurable']['thread_id']}")
+    print(f"⏱️ Timing summary: {json.dumps(instrumentation.summary(), indent=2)}")
+    instrumentation.close()
+    if checkpoint_db:
+        print(f"💾 Checkpoint storage: {json.dumps(checkpointer.stats(), indent=2)}")
+        checkpointer.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,9 +6,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from langchain.agents import create_react_agent, AgentExecutor
 from langchain_core.tools import tool
 from langchain import hub
-from llm.gemini import get_gemini_client
-import requests
+from llm import get_client
+from utils import safe_math
+from utils.agent_batch import run_agent_batch
+from utils.instrumentation import InstrumentationHandler
+from utils.wikipedia import get_wikipedia_client
 from datetime import datetime
+import json
 from langchain_core.prompts import PromptTemplate
 
 # Define custom tools using @tool decorator
@@ -21,13 +25,9 @@ def get_current_time() -> str:
 def calculate_math(expression: str) -> str:
     """Calculate a mathematical expression. Use Python syntax."""
     try:
-        # For safety, only allow basic math operations
-        allowed_chars = set('0123456789+-*/().= ')
-        if all(c in allowed_chars for c in expression):
-            result = eval(expression)
-            return str(result)
-        else:
-            return "Error: Invalid characters in expression"
+        # Parsed to an AST of basic arithmetic only, with bounded exponents and result size
+        result = safe_math.evaluate(expression)
+        return str(result)
     except Exception as e:
         return f"Error: {str(e)}"
 
@@ -35,12 +35,10 @@ def calculate_math(expression: str) -> str:
 def search_wikipedia(query: str) -> str:
     """Search Wikipedia for information about a topic."""
     try:
-        # Simple Wikipedia API call
-        url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{query}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            return f"Title: {data.get('title', 'N/A')}\nSummary: {data.get('extract', 'No summary available')}"
+        # Pooled session with timeouts/retries, backed by an on-disk summary cache
+        summary = get_wikipedia_client().summary(query)
+        if summary is not None:
+            return f"Title: {summary['title']}\nSummary: {summary['extract']}"
         else:
             return f"Could not find information about {query}"
     except Exception as e:
@@ -69,7 +67,7 @@ Thought:{agent_scratchpad}"""
 
 def main():
     # Get the LLM
-    llm = get_gemini_client()
+    llm = get_client()
     
     # Tools are now just the decorated functions
     tools = [get_current_time, calculate_math, search_wikipedia]
@@ -86,9 +84,11 @@ def main():
     agent_executor = AgentExecutor(
         agent=agent,
         tools=tools,
-        verbose=True,
+        # Queries run concurrently, so print steps per query instead of interleaved logs
+        verbose=False,
         handle_parsing_errors=True,
-        max_iterations=5
+        max_iterations=5,
+        return_intermediate_steps=True
     )
     
     # Example queries
@@ -99,18 +99,29 @@ def main():
         # "What's the current time and calculate 100 divided by 4?"
     ]
     
-    for i, query in enumerate(queries, 1):
+    # Run all queries concurrently, at most 4 in flight
+    instrumentation = InstrumentationHandler(trace_path=".cache/traces/react_agent.jsonl")
+    report = run_agent_batch(agent_executor, queries, max_concurrency=4,
+                             config={"callbacks": [instrumentation]})
+    
+    for result in report.results:
         print(f"\n{'='*50}")
-        print(f"Query {i}: {query}")
+        print(f"Query {result.index + 1}: {result.query}")
         print('='*50)
         
-        try:
-            result = agent_executor.invoke({"input": query})
-            print(f"\nFinal Answer: {result['output']}")
-        except Exception as e:
-            print(f"Error: {str(e)}")
+        for action, observation in result.intermediate_steps:
+            print(f"Action: {action.tool}({action.tool_input}) -> {observation}")
+        
+        if result.error is None:
+            print(f"\nFinal Answer: {result.output}")
+        else:
+            print(f"Error: {result.error}")
         
         print("\n" + "-"*50)
+    
+    print(f"\n📊 Batch summary: {report.summary()}")
+    print(f"⏱️ Timing summary: {json.dumps(instrumentation.summary(), indent=2)}")
+    instrumentation.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
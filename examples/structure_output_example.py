@@ -5,6 +5,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from llm.gemini import get_gemini_client
 from llm.deepseek import get_deepseek_client
+from llm.structured_cache import with_cached_structured_output, SQLiteCache
 from pydantic import BaseModel, Field
 from typing import List
 import json
@@ -30,13 +31,16 @@ def main():
     llm = get_gemini_client()
     # llm = get_deepseek_client()
     
+    # Identical (model, schema, prompt) inputs are served from disk on later runs
+    cache = SQLiteCache()
+    
     # Structured output for country information
-    structured_llm = llm.with_structured_output(CountryInfo)
+    structured_llm = with_cached_structured_output(llm, CountryInfo, cache=cache)
     response = structured_llm.invoke("Tell me about France - its capital, population, and continent")
     print(json.dumps(response.model_dump(), indent=2))
     print()    
     # Structured output for quantum computing explanation
-    quantum_llm = llm.with_structured_output(QuantumExplanation)
+    quantum_llm = with_cached_structured_output(llm, QuantumExplanation, cache=cache)
     quantum_response = quantum_llm.invoke("Explain quantum computing in simple terms with key concepts and applications")
     print(json.dumps(quantum_response.model_dump(), indent=2))
 if __name__ == "__main__":
@@ -1 +1,25 @@
-# llm/__init__.py
\ No newline at end of file
+# llm/__init__.py
+import os
+
+PROVIDERS = ("gemini", "deepseek", "fake")
+
+def get_client(provider: str = None, **kwargs):
+    """
+    Return a chat client for provider ("gemini", "deepseek" or "fake").
+
+    Defaults to the LLM_PROVIDER environment variable, then "gemini", so the
+    same code can run against a live endpoint or the offline fake backend.
+    """
+    from llm.registry import load_env
+    load_env()
+    provider = provider or os.getenv("LLM_PROVIDER", "gemini")
+    if provider == "gemini":
+        from llm.gemini import get_gemini_client
+        return get_gemini_client(**kwargs)
+    if provider == "deepseek":
+        from llm.deepseek import get_deepseek_client
+        return get_deepseek_client(**kwargs)
+    if provider == "fake":
+        from llm.fake import get_fake_client
+        return get_fake_client(**kwargs)
+    raise ValueError(f"Unknown LLM provider '{provider}', expected one of {PROVIDERS}")
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import threading
+import weakref
+from typing import Optional
+from llm.registry import load_env
+
+def default_max_in_flight() -> int:
+    """Default cap on in-flight requests per provider: LLM_MAX_IN_FLIGHT (from the environment or .env), else 8."""
+    load_env()
+    return int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+
+class ConcurrencyGovernor:
+    """
+    Bounds the number of in-flight requests per provider.
+
+    Each provider gets its own asyncio.Semaphore per event loop, so any number
+    of coroutines can share one provider budget without exceeding it.
+    """
+
+    def __init__(self, default_limit: Optional[int] = None):
+        if default_limit is not None and default_limit < 1:
+            raise ValueError("default_limit must be at least 1")
+        # None: resolved from the environment on first use, after .env is loaded
+        self._default_limit = default_limit
+        self._limits = {}
+        # Semaphores are bound to the loop they are used on, so keep one set per loop
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @property
+    def default_limit(self) -> int:
+        if self._default_limit is None:
+            limit = default_max_in_flight()
+            if limit < 1:
+                raise ValueError("LLM_MAX_IN_FLIGHT must be at least 1")
+            self._default_limit = limit
+        return self._default_limit
+
+    def set_limit(self, provider: str, limit: int):
+        """Set the maximum number of in-flight requests for a provider."""
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        with self._lock:
+            self._limits[provider] = limit
+            # Semaphores created under the old limit are rebuilt on next use
+            for semaphores in self._semaphores.values():
+                semaphores.pop(provider, None)
+
+    def get_limit(self, provider: str) -> int:
+        return self._limits.get(provider, self.default_limit)
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Return the semaphore guarding provider on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            semaphore = semaphores.get(provider)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.get_limit(provider))
+                semaphores[provider] = semaphore
+            return semaphore
+
+    async def ainvoke(self, provider: str, runnable, input, config=None, **kwargs):
+        """Run runnable.ainvoke once a slot for provider is free."""
+        async with self.semaphore(provider):
+            return await runnable.ainvoke(input, config, **kwargs)
+
+    async def abatch(self, provider: str, runnable, inputs, config=None,
+                     return_exceptions: bool = False, **kwargs) -> list:
+        """
+        Run runnable over all inputs concurrently within the provider limit.
+
+        Results are returned in input order. With return_exceptions=True a failed
+        input yields its exception instead of cancelling the whole batch.
+        """
+        tasks = [self.ainvoke(provider, runnable, item, config, **kwargs) for item in inputs]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+# Shared by all provider modules in this package
+governor = ConcurrencyGovernor()
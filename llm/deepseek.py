@@ -1,18 +1,47 @@
 # pip3 install langchain_openai
 # python3 deepseek_langchain.py
 import os
-import dotenv
+import asyncio
+import httpx
 from langchain_openai.chat_models.base import BaseChatOpenAI
+from llm.registry import registry, load_env
 
-def get_deepseek_client():
-    dotenv.load_dotenv()
+DEEPSEEK_BASE_URL = 'https://ark.cn-beijing.volces.com/api/v3'
+
+# Keep-alive limits for the connection pool shared by every deepseek client
+POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60)
+
+def _http_client():
+    return registry.get_pool("deepseek", lambda: httpx.Client(limits=POOL_LIMITS))
+
+def _http_async_client():
+    return registry.get_pool("deepseek_async", lambda: httpx.AsyncClient(limits=POOL_LIMITS))
+
+def get_deepseek_client(model: str = None, temperature: float = None, max_tokens: int = None,
+                        base_url: str = DEEPSEEK_BASE_URL):
+    load_env()
     api_key = os.getenv("API_KEY")
-    model = os.getenv("MODEL")
-    llm = BaseChatOpenAI(
-        model=model, 
-        openai_api_key=api_key,
-        openai_api_base='https://ark.cn-beijing.volces.com/api/v3',
-    )
-    
-    return llm
+    model = model or os.getenv("MODEL")
+
+    def build():
+        return BaseChatOpenAI(
+            model=model, 
+            openai_api_key=api_key,
+            openai_api_base=base_url,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            http_client=_http_client(),
+            http_async_client=_http_async_client(),
+        )
+
+    key = registry.make_key("deepseek", model, base_url, temperature, max_tokens)
+    return registry.get_or_create(key, build)
 
+async def get_deepseek_client_async(model: str = None, temperature: float = None, max_tokens: int = None,
+                                    base_url: str = DEEPSEEK_BASE_URL):
+    """
+    Async variant of get_deepseek_client. Client construction runs in a worker
+    thread so a cold registry miss never blocks the event loop. Pair it with
+    llm.concurrency.governor to bound in-flight ainvoke/abatch requests.
+    """
+    return await asyncio.to_thread(get_deepseek_client, model, temperature, max_tokens, base_url)
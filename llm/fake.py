@@ -0,0 +1,225 @@
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, AsyncIterator, List, Optional, Sequence, Tuple, Union
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field, PrivateAttr
+from llm.registry import registry
+
+# A scripted response: plain text, a ready AIMessage, a dict with "content" and
+# optional "tool_calls" ([{"name", "args"}]), or a callable building one of
+# those from the conversation so far.
+Response = Union[str, AIMessage, Dict[str, Any], Callable[[List[BaseMessage]], Any]]
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+
+def _count_tokens(text: str) -> int:
+    # Whitespace tokens: deterministic and good enough for relative measurements
+    return len(text.split())
+
+def _default_value(schema: Dict[str, Any], defs: Dict[str, Any], seen: frozenset = frozenset()) -> Any:
+    """Deterministic placeholder value matching a JSON schema."""
+    if not schema:
+        # Empty schema: a recursive reference cut by convert_to_openai_tool
+        return None
+    if "$ref" in schema:
+        name = schema["$ref"].split("/")[-1]
+        if name in seen:
+            return None
+        return _default_value(defs.get(name, {}), defs, seen | {name})
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return _default_value(options[0], defs, seen) if options else None
+    if "enum" in schema:
+        return schema["enum"][0]
+    schema_type = schema.get("type", "string")
+    if schema_type == "object":
+        properties = schema.get("properties", {})
+        required = schema.get("required", list(properties))
+        return {name: _default_value(properties[name], defs, seen) for name in required if name in properties}
+    if schema_type == "array":
+        item = _default_value(schema.get("items", {}), defs, seen)
+        return [] if item is None else [item]
+    return {"string": "sample", "integer": 1, "number": 1.0, "boolean": True}.get(schema_type)
+
+class FakeChatModel(BaseChatModel):
+    """
+    Deterministic offline chat model for benchmarks and load tests.
+
+    Replies come from rules (regex matched against the last message, first
+    match wins), then from the scripted responses in order (cycling), then
+    from default_response. When tools are bound with a forced tool_choice,
+    as with_structured_output does, a call to the forced tool is generated
+    from structured_responses or from placeholder values matching its schema.
+    latency is slept before the first token and token_latency between
+    streamed chunks, so framework overhead can be measured apart from model
+    time. Token counts are whitespace word counts.
+    """
+
+    responses: List[Any] = Field(default_factory=list)
+    rules: List[Tuple[str, Any]] = Field(default_factory=list)
+    default_response: Any = "OK"
+    structured_responses: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    latency: float = 0.0
+    token_latency: float = 0.0
+    model_name: str = "fake"
+
+    _index: int = PrivateAttr(default=0)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _call_ids: Any = PrivateAttr(default_factory=itertools.count)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name}
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[Union[str, Dict[str, Any]]] = None, **kwargs):
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, tool_choice=tool_choice, **kwargs)
+
+    # -- response selection -----------------------------------------------
+
+    def _pick(self, messages: List[BaseMessage]) -> Response:
+        last = _text(messages[-1].content) if messages else ""
+        for pattern, response in self.rules:
+            if re.search(pattern, last):
+                return response
+        if self.responses:
+            with self._lock:
+                response = self.responses[self._index % len(self.responses)]
+                self._index += 1
+            return response
+        return self.default_response
+
+    def _forced_tool(self, tools: Optional[List[Dict[str, Any]]], tool_choice: Any) -> Optional[Dict[str, Any]]:
+        if not tools or tool_choice in (None, "auto", "none"):
+            return None
+        if isinstance(tool_choice, dict):
+            tool_choice = tool_choice.get("function", {}).get("name") or tool_choice.get("name")
+        if tool_choice in ("any", "required", True):
+            return tools[0]["function"]
+        return next((tool["function"] for tool in tools if tool["function"]["name"] == tool_choice), None)
+
+    def _build_message(self, messages: List[BaseMessage], tools=None, tool_choice=None) -> AIMessage:
+        response = self._pick(messages)
+        if callable(response):
+            response = response(messages)
+        if isinstance(response, AIMessage):
+            message = response.model_copy()
+        elif isinstance(response, dict):
+            message = AIMessage(content=response.get("content", ""), tool_calls=[
+                {"name": call["name"], "args": call.get("args", {}), "id": call.get("id") or f"call_{next(self._call_ids)}"}
+                for call in response.get("tool_calls", [])
+            ])
+        else:
+            message = AIMessage(content=str(response))
+
+        forced = self._forced_tool(tools, tool_choice)
+        if forced is not None and not message.tool_calls:
+            parameters = forced.get("parameters", {})
+            args = self.structured_responses.get(forced["name"])
+            if args is None:
+                args = _default_value(parameters, parameters.get("$defs", {}))
+            message = AIMessage(content="", tool_calls=[
+                {"name": forced["name"], "args": args, "id": f"call_{next(self._call_ids)}"}
+            ])
+
+        prompt_tokens = sum(_count_tokens(_text(m.content)) for m in messages)
+        completion_tokens = _count_tokens(_text(message.content)) + sum(
+            _count_tokens(str(call["args"])) for call in message.tool_calls
+        )
+        message.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        message.response_metadata = {"model_name": self.model_name}
+        return message
+
+    @staticmethod
+    def _chunks(message: AIMessage) -> List[AIMessageChunk]:
+        """Split a message into word chunks, with tool calls and usage on the last one."""
+        words = re.findall(r"\S+\s*", _text(message.content)) or [""]
+        chunks = [AIMessageChunk(content=word, id=message.id) for word in words]
+        chunks[-1] = AIMessageChunk(
+            content=words[-1],
+            id=message.id,
+            tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(message.tool_calls)
+            ],
+            usage_metadata=message.usage_metadata,
+            response_metadata=message.response_metadata,
+        )
+        return chunks
+
+    # -- BaseChatModel hooks ------------------------------------------------
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, tool_choice=None, **kwargs) -> ChatResult:
+        message = self._build_message(messages, tools, tool_choice)
+        if self.latency:
+            time.sleep(self.latency)
+        if self.token_latency:
+            time.sleep(self.token_latency * max(0, message.usage_metadata["output_tokens"] - 1))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, tool_choice=None, **kwargs) -> ChatResult:
+        message = self._build_message(messages, tools, tool_choice)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.token_latency:
+            await asyncio.sleep(self.token_latency * max(0, message.usage_metadata["output_tokens"] - 1))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, tools=None, tool_choice=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        message = self._build_message(messages, tools, tool_choice)
+        if self.latency:
+            time.sleep(self.latency)
+        for i, chunk in enumerate(self._chunks(message)):
+            if i and self.token_latency:
+                time.sleep(self.token_latency)
+            if run_manager is not None:
+                run_manager.on_llm_new_token(_text(chunk.content), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+    async def _astream(self, messages, stop=None, run_manager=None, tools=None, tool_choice=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._build_message(messages, tools, tool_choice)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        for i, chunk in enumerate(self._chunks(message)):
+            if i and self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(_text(chunk.content), chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+def get_fake_client(responses: Optional[List[Response]] = None, rules: Optional[List[Tuple[str, Response]]] = None,
+                    latency: float = 0.0, token_latency: float = 0.0, **kwargs) -> FakeChatModel:
+    """
+    Offline stand-in for get_gemini_client/get_deepseek_client.
+
+    Scripted clients carry their own state, so they are built fresh each call.
+    A plain client (no responses or rules) is memoized in the shared registry
+    per latency setting, like the real providers.
+    """
+    if responses or rules or kwargs:
+        return FakeChatModel(responses=responses or [], rules=rules or [],
+                             latency=latency, token_latency=token_latency, **kwargs)
+    key = registry.make_key("fake", "fake", None, latency, token_latency)
+    return registry.get_or_create(key, lambda: FakeChatModel(latency=latency, token_latency=token_latency))
+
+async def get_fake_client_async(*args, **kwargs) -> FakeChatModel:
+    """Async variant of get_fake_client, matching the other providers."""
+    return get_fake_client(*args, **kwargs)
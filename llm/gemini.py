@@ -1,21 +1,30 @@
 import os
-import dotenv
+import asyncio
 from langchain_google_genai import ChatGoogleGenerativeAI
+from llm.registry import registry, load_env
 
-def get_gemini_client():
-    dotenv.load_dotenv()
+def get_gemini_client(model: str = None, temperature: float = 0.7, max_tokens: int = 1000):
+    load_env()
     api_key = os.getenv("API_KEY")
-    model = os.getenv("MODEL", "gemini-1.5-flash")  # fallback to gemini-1.5-flash if MODEL not set
-    
-    # Create Gemini LLM using LangChain
-    llm = ChatGoogleGenerativeAI(
-        model=model,
-        google_api_key=api_key,
-        temperature=0.7,
-        max_tokens=1000
-    )
-    
-    return llm
+    model = model or os.getenv("MODEL", "gemini-1.5-flash")  # fallback to gemini-1.5-flash if MODEL not set
 
+    # Create Gemini LLM using LangChain. The client owns its transport channel,
+    # so memoizing it per key is what keeps the connection alive across calls.
+    def build():
+        return ChatGoogleGenerativeAI(
+            model=model,
+            google_api_key=api_key,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
 
+    key = registry.make_key("gemini", model, None, temperature, max_tokens)
+    return registry.get_or_create(key, build)
 
+async def get_gemini_client_async(model: str = None, temperature: float = 0.7, max_tokens: int = 1000):
+    """
+    Async variant of get_gemini_client. Client construction runs in a worker
+    thread so a cold registry miss never blocks the event loop. Pair it with
+    llm.concurrency.governor to bound in-flight ainvoke/abatch requests.
+    """
+    return await asyncio.to_thread(get_gemini_client, model, temperature, max_tokens)
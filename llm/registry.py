@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import dotenv
+
+_env_lock = threading.Lock()
+_env_loaded = False
+
+def load_env():
+    """Load the .env file once per process instead of on every client lookup."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _env_lock:
+        if not _env_loaded:
+            dotenv.load_dotenv()
+            _env_loaded = True
+
+class ClientRegistry:
+    """
+    Process-wide cache of chat model clients.
+
+    Clients are memoized per (provider, model, base_url, temperature, max_tokens)
+    key, and each provider gets a single keep-alive HTTP connection pool that
+    all of its clients share.
+    """
+
+    def __init__(self):
+        # Re-entrant: client factories look up the shared pool while holding it
+        self._lock = threading.RLock()
+        self._clients = {}
+        self._pools = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, base_url: str = None,
+                 temperature: float = None, max_tokens: int = None) -> tuple:
+        return (provider, model, base_url, temperature, max_tokens)
+
+    def get_or_create(self, key: tuple, factory):
+        """Return the client cached under key, building it with factory() on a miss."""
+        client = self._clients.get(key)
+        if client is not None:
+            with self._lock:
+                self.hits += 1
+            return client
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
+            client = factory()
+            self._clients[key] = client
+            return client
+
+    def get_pool(self, provider: str, factory):
+        """Return the shared HTTP connection pool for a provider, creating it once."""
+        pool = self._pools.get(provider)
+        if pool is not None:
+            return pool
+        with self._lock:
+            pool = self._pools.get(provider)
+            if pool is None:
+                pool = factory()
+                self._pools[provider] = pool
+            return pool
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._clients),
+                "pools": sorted(self._pools),
+            }
+
+    def _reset(self) -> list:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._clients.clear()
+            self._pools.clear()
+            self.hits = 0
+            self.misses = 0
+        return pools
+
+    def clear(self):
+        """
+        Drop all cached clients and close the shared connection pools.
+
+        Async pools (httpx.AsyncClient only has aclose) are closed on a
+        private event loop, or scheduled on the running one; use aclear()
+        from async code to wait for them.
+        """
+        for pool in self._reset():
+            close = getattr(pool, "close", None)
+            if close is not None:
+                close()
+                continue
+            aclose = getattr(pool, "aclose", None)
+            if aclose is None:
+                continue
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(aclose())
+            else:
+                loop.create_task(aclose())
+
+    async def aclear(self):
+        """Async variant of clear() that awaits every pool's close."""
+        for pool in self._reset():
+            aclose = getattr(pool, "aclose", None)
+            if aclose is not None:
+                await aclose()
+                continue
+            close = getattr(pool, "close", None)
+            if close is not None:
+                close()
+
+# Shared by all provider modules in this package
+registry = ClientRegistry()
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pydantic import BaseModel
+from langchain_core.messages import convert_to_messages
+from langchain_core.prompt_values import PromptValue
+from langchain_core.runnables import Runnable
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "structured_output.sqlite")
+
+class InMemoryLRUCache:
+    """
+    In-process LRU cache with an optional TTL (seconds).
+
+    Stores a validated Pydantic instance, so a hit costs a dict lookup and a
+    copy; callers get their own copy and cannot mutate the cached value.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, schema: type[BaseModel]):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, created_at = entry
+            if self.ttl is not None and time.monotonic() - created_at > self.ttl:
+                del self._data[key]
+                return None
+            if not isinstance(value, schema):
+                # Stored for another class with the same key (e.g. a rebuilt dynamic model)
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return value.model_copy(deep=True)
+
+    def set(self, key: str, value: BaseModel):
+        value = value.model_copy(deep=True)
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class SQLiteCache:
+    """
+    On-disk cache that survives restarts. Values are stored as JSON and
+    re-validated against the requested schema on a hit.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = None):
+        self.path = path
+        self.ttl = ttl
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS structured_output ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, schema: type[BaseModel]):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM structured_output WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl is not None and time.time() - created_at > self.ttl:
+            with self._lock:
+                self._conn.execute("DELETE FROM structured_output WHERE key = ?", (key,))
+                self._conn.commit()
+            return None
+        return schema.model_validate_json(value)
+
+    def set(self, key: str, value: BaseModel):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO structured_output (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value.model_dump_json(), time.time()),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM structured_output")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# Weak keys, so caching a fingerprint does not keep rebuilt dynamic models alive
+_fingerprints = weakref.WeakKeyDictionary()
+_fingerprints_lock = threading.Lock()
+
+def _schema_fingerprint(schema: type[BaseModel]) -> str:
+    """Canonical JSON schema of an output model, computed once per class."""
+    fingerprint = _fingerprints.get(schema)
+    if fingerprint is None:
+        fingerprint = json.dumps(schema.model_json_schema(), sort_keys=True, separators=(",", ":"))
+        with _fingerprints_lock:
+            _fingerprints[schema] = fingerprint
+    return fingerprint
+
+def _normalize_messages(input) -> list:
+    if isinstance(input, PromptValue):
+        messages = input.to_messages()
+    elif isinstance(input, str):
+        messages = convert_to_messages([input])
+    else:
+        messages = convert_to_messages(input)
+    return [{"type": m.type, "name": m.name, "content": m.content} for m in messages]
+
+def _model_name(llm) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+def make_cache_key(model_name: str, schema: type[BaseModel], input, options: dict = None) -> str:
+    """Stable hash of (model name, output JSON schema, with_structured_output options, normalized messages)."""
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "schema": _schema_fingerprint(schema),
+            "options": options or {},
+            "messages": _normalize_messages(input),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class CachedStructuredOutput(Runnable):
+    """
+    Wraps llm.with_structured_output(schema) and serves repeated
+    (model, schema, prompt) inputs from cache without calling the provider.
+
+    It is a Runnable, so batch/abatch, stream and | composition work as on
+    the wrapped runnable; each goes through the cached invoke/ainvoke.
+    """
+
+    def __init__(self, llm, schema: type[BaseModel], cache=None, **kwargs):
+        self.name = f"Cached{schema.__name__}"
+        self.schema = schema
+        self.model_name = _model_name(llm)
+        self.cache = cache if cache is not None else InMemoryLRUCache()
+        # method, include_raw, strict... change what the provider returns, so they are part of the key
+        self.options = kwargs
+        self.structured_llm = llm.with_structured_output(schema, **kwargs)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def OutputType(self) -> type[BaseModel]:
+        return self.schema
+
+    def cache_key(self, input) -> str:
+        return make_cache_key(self.model_name, self.schema, input, self.options)
+
+    def invoke(self, input, config=None, **kwargs):
+        key = self.cache_key(input)
+        cached = self.cache.get(key, self.schema)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        result = self.structured_llm.invoke(input, config, **kwargs)
+        self._store(key, result)
+        return result
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        key = self.cache_key(input)
+        cached = self.cache.get(key, self.schema)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        result = await self.structured_llm.ainvoke(input, config, **kwargs)
+        self._store(key, result)
+        return result
+
+    def _store(self, key: str, result):
+        # Only cache well-formed results; a None/raw response is retried next time
+        if isinstance(result, self.schema):
+            self.cache.set(key, result)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+def with_cached_structured_output(llm, schema: type[BaseModel], cache=None, **kwargs) -> CachedStructuredOutput:
+    """Drop-in replacement for llm.with_structured_output(schema) backed by a response cache."""
+    return CachedStructuredOutput(llm, schema, cache=cache, **kwargs)
@@ -0,0 +1,57 @@
+from utils.DynamicModelBuilder import DynamicModelBuilder, ModelDefinition
+
+def _model():
+    return DynamicModelBuilder.create_pydantic_model(ModelDefinition(
+        model_name="Row",
+        fields=[{"name": "x", "type": "integer", "description": "x"}],
+    ))
+
+def test_validate_jsonl_comma_joined_line_is_an_error():
+    lines = [b'{"x": 1}', b'{"x": 2},{"x": 3}', b'{"x": 4}']
+    result = DynamicModelBuilder.validate_jsonl(_model(), lines)
+    assert [row.x for row in result.valid] == [1, 4]
+    assert result.valid_indices == [0, 2]
+    assert [error.index for error in result.errors] == [1]
+
+def test_inferred_model_validates_its_samples():
+    samples = [
+        {"id": 1, "code": "A1", "scores": [1.5, 2.0], "flags": [True, False], "mixed": [1, "a"], "tags": []},
+        {"id": 2.5, "code": 7, "scores": [3, 4], "flags": [], "mixed": ["b"], "tags": 3},
+        {"id": 3, "code": None, "scores": [0.1], "flags": [False], "mixed": [{"k": 1}], "extra": {"a": 1}},
+    ]
+    model_def = DynamicModelBuilder.infer_model_definition(samples)
+    model = DynamicModelBuilder.create_pydantic_model(model_def)
+    for sample in samples:
+        model.model_validate(sample)
+    types = {field.name: field.type.value for field in model_def.fields}
+    assert types["id"] == "float"
+    assert types["scores"] == "list_float"
+    assert types["flags"] == "list_boolean"
+
+def test_validate_jsonl_lines_split_mid_object_are_errors():
+    lines = [b'{"x": 1},{"x": 2}', b'{"x": 3', b'"y": 4}', b'{"x": 5}']
+    result = DynamicModelBuilder.validate_jsonl(_model(), lines)
+    assert [row.x for row in result.valid] == [5]
+    assert result.valid_indices == [3]
+    assert [error.index for error in result.errors] == [0, 1, 2]
+
+def test_inferred_model_accepts_reserved_and_invalid_keys():
+    samples = [{"_id": "a1", "model_config": 1, "first name": "Ann", "id": 7}]
+    model_def = DynamicModelBuilder.infer_model_definition(samples)
+    model = DynamicModelBuilder.create_pydantic_model(model_def)
+    instance = model.model_validate(samples[0])
+    assert instance.model_dump(by_alias=True) == samples[0]
+    assert {field.alias for field in model_def.fields} == {"_id", "model_config", "first name", None}
+
+def test_gemini_spec_marks_cut_recursive_refs_as_empty_objects():
+    model = DynamicModelBuilder.create_pydantic_model(ModelDefinition(
+        model_name="TreeNode",
+        fields=[
+            {"name": "label", "type": "string", "description": "Node label"},
+            {"name": "children", "type": "list_object", "ref": "TreeNode", "description": "Child nodes"},
+            {"name": "parent", "type": "optional_object", "ref": "TreeNode", "description": "Parent node"},
+        ],
+    ))
+    properties = DynamicModelBuilder.tool_spec(model, "gemini")["parameters"]["properties"]
+    assert properties["children"]["items"] == {"type": "object", "properties": {}}
+    assert properties["parent"] == {"type": "object", "properties": {}, "nullable": True, "description": "Parent node"}
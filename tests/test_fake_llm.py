@@ -0,0 +1,23 @@
+from llm.fake import FakeChatModel, _default_value
+from utils.DynamicModelBuilder import DynamicModelBuilder, ModelDefinition
+
+def _tree_model():
+    return DynamicModelBuilder.create_pydantic_model(ModelDefinition(
+        model_name="TreeNode",
+        fields=[
+            {"name": "label", "type": "string", "description": "Node label"},
+            {"name": "children", "type": "list_object", "ref": "TreeNode", "description": "Child nodes"},
+            {"name": "parent", "type": "optional_object", "ref": "TreeNode", "description": "Parent node"},
+        ],
+    ))
+
+def test_structured_output_of_self_referential_model():
+    node = FakeChatModel().with_structured_output(_tree_model()).invoke("Describe a tree")
+    assert node.label == "sample"
+    assert node.children == []
+    assert node.parent is None
+
+def test_default_value_stops_at_recursive_refs():
+    schema = _tree_model().model_json_schema()
+    value = _default_value(schema, schema["$defs"])
+    assert value == {"label": "sample", "children": [], "parent": None}
@@ -0,0 +1,39 @@
+import asyncio
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage
+from llm.fake import FakeChatModel
+from utils.history_compaction import HistoryCompactor
+
+class AsyncOnlyModel(FakeChatModel):
+    def _generate(self, *args, **kwargs):
+        raise AssertionError("summary called the blocking sync path")
+
+class RunNames(BaseCallbackHandler):
+    def __init__(self):
+        self.names = []
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self.names.append(kwargs.get("name"))
+
+def _history(turns: int):
+    messages = []
+    for i in range(turns):
+        messages += [HumanMessage(content=f"question {i} " * 20, id=f"h{i}"), AIMessage(content=f"answer {i} " * 20, id=f"a{i}")]
+    return messages
+
+def _config(handler):
+    return {"configurable": {"thread_id": "t"}, "callbacks": [handler]}
+
+def test_summary_runs_under_the_hook_config():
+    compactor = HistoryCompactor(FakeChatModel(default_response="summary"), max_tokens=200)
+    handler = RunNames()
+    result = compactor.invoke({"messages": _history(10)}, _config(handler))
+    assert result["llm_input_messages"][0].content.endswith("summary")
+    assert handler.names == ["history_summary"]
+
+def test_async_hook_summarizes_with_ainvoke():
+    compactor = HistoryCompactor(AsyncOnlyModel(default_response="summary"), max_tokens=200)
+    handler = RunNames()
+    result = asyncio.run(compactor.ainvoke({"messages": _history(10)}, _config(handler)))
+    assert result["llm_input_messages"][0].content.endswith("summary")
+    assert handler.names == ["history_summary"]
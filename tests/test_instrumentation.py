@@ -0,0 +1,28 @@
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph_swarm import create_handoff_tool, create_swarm
+from langgraph.prebuilt import create_react_agent
+from llm.fake import FakeChatModel
+from utils.instrumentation import InstrumentationHandler
+from utils.swarm_builder import SwarmBuilder
+
+def _builder_app(model):
+    swarm = SwarmBuilder(model)
+    swarm.add_agent("Alice", "You are Alice.", [create_handoff_tool(agent_name="Bob")])
+    swarm.add_agent("Bob", "You are Bob.", [create_handoff_tool(agent_name="Alice")])
+    return swarm.build(default_active_agent="Alice")
+
+def _stock_app(model):
+    alice = create_react_agent(model, [create_handoff_tool(agent_name="Bob")], prompt="You are Alice.", name="Alice")
+    bob = create_react_agent(model, [create_handoff_tool(agent_name="Alice")], prompt="You are Bob.", name="Bob")
+    return create_swarm([alice, bob], default_active_agent="Alice")
+
+def test_swarm_node_counted_once_per_turn():
+    for build in (_builder_app, _stock_app):
+        app = build(FakeChatModel(default_response="Done.")).compile(checkpointer=InMemorySaver())
+        handler = InstrumentationHandler()
+        config = {"configurable": {"thread_id": "t"}, "callbacks": [handler]}
+        for i in range(3):
+            app.invoke({"messages": [{"role": "user", "content": f"turn {i}"}]}, config)
+        spans = handler.summary()["spans"]
+        assert spans["node:Alice"]["count"] == 3
+        assert spans["llm:fake"]["count"] == 3
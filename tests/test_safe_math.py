@@ -0,0 +1,53 @@
+import time
+import pytest
+from utils import safe_math
+from utils.safe_math import compile_expression, evaluate, evaluate_many
+
+def test_basic_arithmetic_and_variables():
+    assert evaluate("2 + 3 * 4") == 14
+    assert evaluate("-(7 // 2) % 5") == 2
+    assert evaluate_many("x ** 2 + y", [{"x": 2, "y": 1}, {"x": 3, "y": 0}]) == [5, 9]
+
+@pytest.mark.parametrize("expression", ["9**9**9", "2**100000", "10**5000", "2.5**100000"])
+def test_huge_powers_rejected_quickly(expression):
+    start = time.monotonic()
+    with pytest.raises(ValueError):
+        evaluate(expression)
+    assert time.monotonic() - start < 0.5
+
+def test_large_multiplication_rejected():
+    with pytest.raises(ValueError, match="too large"):
+        evaluate("(10**1000) * (10**1000)")
+    with pytest.raises(ValueError, match="too large"):
+        evaluate("x * x", {"x": 2 ** 4000})
+
+def test_non_real_result_rejected():
+    with pytest.raises(ValueError, match="not a real number"):
+        evaluate("(-8) ** 0.5")
+
+def test_length_and_nesting_limits():
+    with pytest.raises(ValueError, match="longer"):
+        evaluate("1+" * safe_math.MAX_EXPRESSION_LENGTH + "1")
+    nested = "(" * (safe_math.MAX_DEPTH + 5) + "1" + ")" * (safe_math.MAX_DEPTH + 5)
+    assert evaluate(nested) == 1
+    with pytest.raises(ValueError, match="nested too deeply"):
+        evaluate("-" * (safe_math.MAX_DEPTH + 5) + "1")
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os')", "abs(-1)", "(1).real", "x.__class__", "[1, 2]", "'a' * 3", "1 if 1 else 2", "lambda: 1",
+])
+def test_rejected_syntax(expression):
+    with pytest.raises(ValueError):
+        evaluate(expression, {"x": 1})
+
+def test_unknown_variable():
+    with pytest.raises(ValueError, match="Unknown variable 'y'"):
+        evaluate("x + y", {"x": 1})
+
+def test_compiled_expressions_are_cached():
+    expression = "a * 3 + 1"
+    compiled = compile_expression(expression)
+    assert compile_expression(expression) is compiled
+    hits = compile_expression.cache_info().hits
+    assert evaluate(expression, {"a": 2}) == 7
+    assert compile_expression.cache_info().hits == hits + 1
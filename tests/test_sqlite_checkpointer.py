@@ -0,0 +1,32 @@
+from langgraph_swarm import create_handoff_tool
+from llm.fake import FakeChatModel
+from utils.sqlite_checkpointer import SQLiteCheckpointer
+from utils.swarm_builder import SwarmBuilder
+
+def _app(checkpointer):
+    swarm = SwarmBuilder(FakeChatModel(default_response="Done."))
+    swarm.add_agent("Alice", "You are Alice.", [create_handoff_tool(agent_name="Bob")])
+    swarm.add_agent("Bob", "You are Bob.", [create_handoff_tool(agent_name="Alice")])
+    return swarm.build(default_active_agent="Alice").compile(checkpointer=checkpointer)
+
+def _run_turns(app, turns):
+    config = {"configurable": {"thread_id": "t"}}
+    for i in range(turns):
+        result = app.invoke({"messages": [{"role": "user", "content": f"turn {i}"}]}, config)
+    return result
+
+def test_keep_last_bounds_checkpoints_across_subgraph_namespaces(tmp_path):
+    with SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"), keep_last=3) as checkpointer:
+        app = _app(checkpointer)
+        counts = []
+        for _ in range(4):
+            _run_turns(app, 10)
+            counts.append(checkpointer.stats()["checkpoints"])
+        namespaces = {
+            ns for (ns,) in checkpointer._conn.execute("SELECT DISTINCT checkpoint_ns FROM checkpoints")
+        }
+        result = app.get_state({"configurable": {"thread_id": "t"}}).values
+    assert max(counts) <= 20
+    assert counts[-1] <= counts[0]
+    assert len(namespaces) <= 4
+    assert len(result["messages"]) == 80
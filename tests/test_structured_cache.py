@@ -0,0 +1,32 @@
+import asyncio
+from typing import List
+from pydantic import BaseModel
+from langchain_core.runnables import RunnableLambda
+from llm.fake import FakeChatModel
+from llm.structured_cache import with_cached_structured_output
+
+class Answer(BaseModel):
+    text: str
+    tags: List[str]
+
+def _cached():
+    model = FakeChatModel(structured_responses={"Answer": {"text": "hi", "tags": ["a"]}})
+    return with_cached_structured_output(model, Answer)
+
+def test_cached_output_is_a_runnable():
+    cached = _cached()
+    assert [a.text for a in cached.batch(["q1", "q2"])] == ["hi", "hi"]
+    assert [a.text for a in cached.stream("q1")] == ["hi"]
+    chain = RunnableLambda(lambda topic: f"About {topic}") | cached
+    assert chain.invoke("cats").tags == ["a"]
+    assert asyncio.run(cached.ainvoke("q2")).text == "hi"
+    assert cached.stats() == {"hits": 2, "misses": 3}
+
+def test_in_memory_hits_are_copies():
+    cached = _cached()
+    first = cached.invoke("q")
+    first.tags.append("mutated")
+    second = cached.invoke("q")
+    second.text = "changed"
+    assert cached.invoke("q") == Answer(text="hi", tags=["a"])
+    assert cached.stats() == {"hits": 2, "misses": 1}
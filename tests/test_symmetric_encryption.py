@@ -0,0 +1,149 @@
+import base64
+import io
+import json
+import struct
+import time
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
+from utils.symmetric_encryption import (
+    DEFAULT_ITERATIONS,
+    FRAME_FINAL_FLAG,
+    HEADER_FORMAT,
+    KEYRING_MAGIC,
+    LEGACY_SALT,
+    MAX_ITERATIONS,
+    SALT_SIZE,
+    STREAM_HEADER_SIZE,
+    TOKEN_MAGIC,
+    KeyRing,
+    SymmetricKeyEncryption,
+    derive_key,
+    process_batch_file,
+)
+
+def test_batch_file_reports_bad_lines_and_continues(tmp_path):
+    source = tmp_path / "in.jsonl"
+    source.write_text('{"id": 0, "key": "a"}\n{"id": 1, "key":\n[1, 2]\n{"id": 3}\n{"id": 4, "key": "e"}\n')
+    encrypted, decrypted = tmp_path / "enc.jsonl", tmp_path / "out.jsonl"
+    encryptor = SymmetricKeyEncryption("pw")
+    report = process_batch_file(encryptor, "encrypt", str(source), str(encrypted), "key", workers=1)
+    assert report.rows == 5
+    assert [row for row, _ in report.errors] == [1, 2, 3]
+    report = process_batch_file(encryptor, "decrypt", str(encrypted), str(decrypted), "key", workers=1)
+    assert report.errors == [(1, "missing field 'key'")]
+    rows = [json.loads(line) for line in decrypted.read_text().splitlines()]
+    assert rows == [{"id": 0, "key": "a"}, {"id": 3}, {"id": 4, "key": "e"}]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["enc.jsonl", "in.jsonl", "out.jsonl"]
+
+def _frames(data: bytes):
+    """Split an encrypted stream into its header and raw frames (length prefix included)."""
+    header, frames, offset = data[:STREAM_HEADER_SIZE], [], STREAM_HEADER_SIZE
+    while offset < len(data):
+        (length,) = struct.unpack_from(">I", data, offset)
+        end = offset + 4 + (length & ~FRAME_FINAL_FLAG)
+        frames.append(data[offset:end])
+        offset = end
+    return header, frames
+
+def _encrypt_stream(encryptor, plaintext: bytes, chunk_size: int = 16) -> bytes:
+    dst = io.BytesIO()
+    assert encryptor.encrypt_stream(io.BytesIO(plaintext), dst, chunk_size) == len(plaintext)
+    return dst.getvalue()
+
+def _decrypt_stream(encryptor, data: bytes) -> bytes:
+    dst = io.BytesIO()
+    encryptor.decrypt_stream(io.BytesIO(data), dst)
+    return dst.getvalue()
+
+@pytest.mark.parametrize("size", [0, 1, 16, 17, 100])
+@pytest.mark.parametrize("password", [None, "pw"])
+def test_stream_roundtrip(size, password):
+    encryptor = SymmetricKeyEncryption(password)
+    plaintext = bytes(range(256))[:size]
+    assert _decrypt_stream(encryptor, _encrypt_stream(encryptor, plaintext)) == plaintext
+
+def test_stream_truncated_reordered_or_extended_is_rejected():
+    encryptor = SymmetricKeyEncryption("pw")
+    data = _encrypt_stream(encryptor, b"x" * 64)
+    header, frames = _frames(data)
+    assert len(frames) == 4
+    tampered = [
+        header + b"".join(frames[:2]),                             # final frame dropped
+        data[:-1],                                                 # final frame cut short
+        header + frames[1] + frames[0] + b"".join(frames[2:]),     # frames swapped
+        header + b"".join(frames[:2]) + frames[3],                 # middle frame dropped
+        data + b"\0",                                              # trailing data
+        b"XXXX" + data[4:],                                        # wrong magic
+        data[:STREAM_HEADER_SIZE - 1],                             # short header
+    ]
+    for candidate in tampered:
+        with pytest.raises(InvalidToken):
+            _decrypt_stream(encryptor, candidate)
+
+def test_decrypt_file_leaves_nothing_behind_on_failure(tmp_path):
+    encryptor = SymmetricKeyEncryption("pw")
+    source, encrypted, output = tmp_path / "plain.bin", tmp_path / "plain.enc", tmp_path / "out.bin"
+    source.write_bytes(b"secret" * 5000)
+    encryptor.encrypt_file(str(source), str(encrypted), chunk_size=1024)
+    assert encryptor.decrypt_file(str(encrypted), str(output)) == 30000
+    assert output.read_bytes() == source.read_bytes()
+
+    output.write_bytes(b"previous")
+    encrypted.write_bytes(encrypted.read_bytes()[:-10])
+    with pytest.raises(InvalidToken):
+        encryptor.decrypt_file(str(encrypted), str(output))
+    with pytest.raises(FileNotFoundError):
+        encryptor.decrypt_file(str(tmp_path / "missing.enc"), str(output))
+    assert output.read_bytes() == b"previous"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.bin", "plain.bin", "plain.enc"]
+
+def test_tokens_from_other_instances_and_legacy_tokens_decrypt():
+    encryptor = SymmetricKeyEncryption("pw")
+    other = SymmetricKeyEncryption("pw", iterations=DEFAULT_ITERATIONS + 1)
+    assert encryptor.decrypt_data(other.encrypt_data("hello")) == "hello"
+    legacy = Fernet(derive_key(b"pw", LEGACY_SALT, DEFAULT_ITERATIONS)).encrypt(b"old")
+    assert encryptor.decrypt_data(base64.urlsafe_b64encode(legacy).decode()) == "old"
+
+@pytest.mark.parametrize("iterations", [1, DEFAULT_ITERATIONS - 1, MAX_ITERATIONS + 1, 2 ** 32 - 1])
+def test_header_iteration_count_out_of_range_is_rejected(iterations):
+    encryptor = SymmetricKeyEncryption("pw")
+    token = base64.urlsafe_b64decode(encryptor.encrypt_data("hello"))
+    crafted = struct.pack(HEADER_FORMAT, TOKEN_MAGIC, b"\1" * SALT_SIZE, iterations) + token[struct.calcsize(HEADER_FORMAT):]
+    start = time.monotonic()
+    with pytest.raises(InvalidToken):
+        encryptor.decrypt_bytes(crafted)
+    assert time.monotonic() - start < 1.0
+
+def test_salt_must_fit_the_header():
+    with pytest.raises(ValueError):
+        SymmetricKeyEncryption("pw", salt=b"short")
+    assert SymmetricKeyEncryption("pw", salt=b"s" * SALT_SIZE).salt == b"s" * SALT_SIZE
+
+def test_keyring_rotation_and_legacy_tokens():
+    old, new = SymmetricKeyEncryption("old"), SymmetricKeyEncryption("new")
+    legacy_token = old.encrypt_data("legacy")
+    ring = KeyRing(legacy_key_id="v0")
+    ring.add_key("v0", old)
+    stale = ring.encrypt_data("stale")
+    ring.add_key("v1", new, primary=True)
+    assert ring.decrypt_data(legacy_token) == "legacy"
+    assert ring.needs_rotation(stale)
+    plaintext, rotated = ring.decrypt_and_rotate(stale)
+    assert plaintext == "stale" and not ring.needs_rotation(rotated)
+    assert ring.decrypt_and_rotate(rotated) == ("stale", None)
+
+def test_keyring_rejects_truncated_headers():
+    ring = KeyRing()
+    ring.add_password("primary", "pw")
+    token = base64.urlsafe_b64decode(ring.encrypt_data("hello"))
+    for truncated in (KEYRING_MAGIC, KEYRING_MAGIC + b"\x07", KEYRING_MAGIC + b"\x07prim", KEYRING_MAGIC + b"\x01\xff"):
+        with pytest.raises(InvalidToken):
+            ring.key_id_of(truncated)
+        with pytest.raises(InvalidToken):
+            ring.decrypt_bytes(truncated)
+    with pytest.raises(InvalidToken):
+        ring.decrypt_bytes(token[:len(KEYRING_MAGIC) + 4])
+
+def test_empty_keyring_cannot_encrypt():
+    with pytest.raises(ValueError, match="no keys"):
+        KeyRing().encrypt_data("hello")
@@ -0,0 +1,16 @@
+from langchain_core.tools import tool
+from utils.tool_cache import cached_tool, tool_cache_stats
+
+def _make(result):
+    def lookup(key: str) -> str:
+        """Look up a key."""
+        return f"{result}:{key}"
+    return lookup
+
+def test_same_named_tools_get_separate_caches():
+    first = cached_tool(_make("first"))
+    second = tool(cached_tool(ttl=60)(_make("second")))
+    assert first("k") == "first:k"
+    assert second.invoke({"key": "k"}) == "second:k"
+    assert first("k") == "first:k"
+    assert any(name.endswith("_make.<locals>.lookup") for name in tool_cache_stats())
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+import time
+from langchain_core.tools import tool
+from utils.tool_executor import ToolExecutor
+
+@tool
+def current_thread() -> str:
+    """Name of the thread running this tool."""
+    return threading.current_thread().name
+
+@tool
+async def async_thread() -> str:
+    """Name of the thread running this tool."""
+    return threading.current_thread().name
+
+def _calls(*names):
+    return [{"name": name, "args": {}, "id": f"call_{i}", "type": "tool_call"} for i, name in enumerate(names)]
+
+def test_sync_tool_runs_on_pool_thread():
+    with ToolExecutor([current_thread, async_thread]) as executor:
+        assert not executor._is_async(current_thread)
+        assert executor._is_async(async_thread)
+        sync_result = executor.execute(_calls("current_thread"))
+        async_results = asyncio.run(executor.aexecute(_calls("current_thread", "async_thread")))
+    assert sync_result[0].content.startswith("tool")
+    assert async_results[0].content.startswith("tool")
+    assert async_results[1].content == "MainThread"
+
+@tool
+def stuck() -> str:
+    """Never returns in time."""
+    time.sleep(2)
+    return "late"
+
+def test_timed_out_call_does_not_block_exit():
+    start = time.monotonic()
+    with ToolExecutor([stuck], timeout=0.2) as executor:
+        result = executor.execute(_calls("stuck"))
+    assert result[0].status == "error"
+    assert time.monotonic() - start < 1.0
@@ -1,8 +1,17 @@
-from pydantic import BaseModel, Field, create_model
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, create_model
+from typing import List, Dict, Any, Optional, Iterable, Union
+from collections import OrderedDict
+import hashlib
 import json
+import keyword
+import re
+import threading
+import weakref
 from enum import Enum
 
+# JSON schema keys the Gemini function declaration format does not accept
+GEMINI_UNSUPPORTED_KEYS = {"title", "default", "additionalProperties", "$defs", "$ref", "examples"}
+
 class FieldType(str, Enum):
     STRING = "string"
     INTEGER = "integer"
@@ -10,9 +19,16 @@ class FieldType(str, Enum):
     BOOLEAN = "boolean"
     LIST_STRING = "list_string"
     LIST_INTEGER = "list_integer"
+    LIST_FLOAT = "list_float"
+    LIST_BOOLEAN = "list_boolean"
+    LIST_ANY = "list_any"
     DICT = "dict"
     OPTIONAL_STRING = "optional_string"
     OPTIONAL_INTEGER = "optional_integer"
+    OBJECT = "object"
+    LIST_OBJECT = "list_object"
+    OPTIONAL_OBJECT = "optional_object"
+    ANY = "any"
 
 class FieldDefinition(BaseModel):
     name: str = Field(description="Field name")
@@ -20,31 +36,190 @@ class FieldDefinition(BaseModel):
     description: str = Field(description="Field description")
     required: bool = Field(default=True, description="Whether field is required")
     default_value: Optional[Any] = Field(default=None, description="Default value")
+    ref: Optional[str] = Field(default=None, description="Referenced model name for object fields")
+    alias: Optional[str] = Field(default=None, description="Key of the field in the input data, when it is not a valid field name")
 
 class ModelDefinition(BaseModel):
     model_name: str = Field(description="Name of the Pydantic model")
     fields: List[FieldDefinition] = Field(description="List of field definitions")
+    definitions: List["ModelDefinition"] = Field(default_factory=list, description="Sub-model definitions referenced by object fields")
+
+    def has_references(self) -> bool:
+        """Whether any field points at another ModelDefinition"""
+        return bool(self.definitions) or any(f.type in OBJECT_TYPES for f in self.fields)
+
+class RowError(BaseModel):
+    index: int = Field(description="Position of the record in the input")
+    errors: List[Dict[str, Any]] = Field(description="Pydantic error details for the record")
+
+class BatchValidationResult(BaseModel):
+    valid: List[Any] = Field(default_factory=list, description="Validated model instances, in input order")
+    valid_indices: List[int] = Field(default_factory=list, description="Input position of each valid instance")
+    errors: List[RowError] = Field(default_factory=list, description="Records that failed validation")
+
+# Built once at import time rather than on every field lookup
+TYPE_MAP = {
+    FieldType.STRING: str,
+    FieldType.INTEGER: int,
+    FieldType.FLOAT: float,
+    FieldType.BOOLEAN: bool,
+    FieldType.LIST_STRING: List[str],
+    FieldType.LIST_INTEGER: List[int],
+    FieldType.LIST_FLOAT: List[float],
+    FieldType.LIST_BOOLEAN: List[bool],
+    FieldType.LIST_ANY: List[Any],
+    FieldType.DICT: Dict[str, Any],
+    FieldType.OPTIONAL_STRING: Optional[str],
+    FieldType.OPTIONAL_INTEGER: Optional[int],
+    FieldType.ANY: Any,
+}
+
+# Object fields resolve to forward references by model name, filled in by DefinitionRegistry
+OBJECT_TYPES = {
+    FieldType.OBJECT: lambda ref: ref,
+    FieldType.LIST_OBJECT: lambda ref: List[ref],
+    FieldType.OPTIONAL_OBJECT: lambda ref: Optional[ref],
+}
+
+class DefinitionRegistry:
+    """
+    Resolves ModelDefinitions that reference each other by name.
+
+    Every sub-model is built once and shared by reference wherever it is used,
+    including self-recursive definitions.
+    """
+
+    def __init__(self, definitions: List[ModelDefinition] = ()):
+        self._definitions = {}
+        self._models = {}
+        for model_def in definitions:
+            self.register(model_def)
+
+    def register(self, model_def: ModelDefinition):
+        """Register a definition and, recursively, its nested definitions"""
+        existing = self._definitions.get(model_def.model_name)
+        if existing is not None and existing != model_def:
+            raise ValueError(f"Conflicting definitions for model '{model_def.model_name}'")
+        self._definitions[model_def.model_name] = model_def
+        for sub_def in model_def.definitions:
+            self.register(sub_def)
+
+    def get_model(self, name: str) -> BaseModel:
+        """Return the model class for name, building it and its references on first use"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        pending = self._unbuilt_dependencies(name)
+        for model_name in pending:
+            model_def = self._definitions[model_name]
+            if model_def.has_references():
+                self._models[model_name] = DynamicModelBuilder._build_pydantic_model(model_def)
+            else:
+                # Leaf models go through the shared cache so they are reused process-wide
+                self._models[model_name] = DynamicModelBuilder.create_pydantic_model(model_def)
+
+        # Resolve the forward references now that every referenced class exists
+        for model_name in pending:
+            if self._definitions[model_name].has_references():
+                self._models[model_name].model_rebuild(force=True, _types_namespace=dict(self._models))
+        return self._models[name]
+
+    def _unbuilt_dependencies(self, name: str) -> List[str]:
+        """Names reachable from name (inclusive) that have not been built yet"""
+        pending, stack = [], [name]
+        while stack:
+            model_name = stack.pop()
+            if model_name in self._models or model_name in pending:
+                continue
+            model_def = self._definitions.get(model_name)
+            if model_def is None:
+                raise ValueError(f"Unknown model definition '{model_name}'")
+            pending.append(model_name)
+            for field_def in model_def.fields:
+                if field_def.type in OBJECT_TYPES:
+                    stack.append(field_def.ref)
+        return pending
+
+# Per-class derived objects, held with weak keys so evicted model classes can be collected
+_list_adapters = weakref.WeakKeyDictionary()
+_tool_specs = weakref.WeakKeyDictionary()
 
 class DynamicModelBuilder:
+    # Generated model classes keyed by a canonical hash of their ModelDefinition
+    cache_maxsize = 256
+    _model_cache = OrderedDict()
+    _cache_lock = threading.Lock()
+    _cache_hits = 0
+    _cache_misses = 0
+
     @staticmethod
     def type_mapping(field_def: FieldDefinition):
         """Map FieldType to Python types"""
-        type_map = {
-            FieldType.STRING: str,
-            FieldType.INTEGER: int,
-            FieldType.FLOAT: float,
-            FieldType.BOOLEAN: bool,
-            FieldType.LIST_STRING: List[str],
-            FieldType.LIST_INTEGER: List[int],
-            FieldType.DICT: Dict[str, Any],
-            FieldType.OPTIONAL_STRING: Optional[str],
-            FieldType.OPTIONAL_INTEGER: Optional[int],
-        }
-        return type_map.get(field_def.type, str)
+        if field_def.type in OBJECT_TYPES:
+            if not field_def.ref:
+                raise ValueError(f"Field '{field_def.name}' of type {field_def.type.value} requires 'ref'")
+            return OBJECT_TYPES[field_def.type](field_def.ref)
+        return TYPE_MAP.get(field_def.type, str)
+    
+    @staticmethod
+    def definition_hash(model_def: ModelDefinition) -> str:
+        """Canonical hash of a ModelDefinition, stable across processes"""
+        return hashlib.sha256(model_def.model_dump_json().encode()).hexdigest()
+    
+    @staticmethod
+    def cache_info() -> dict:
+        """Hit/miss counters and current size of the compiled-model cache"""
+        with DynamicModelBuilder._cache_lock:
+            return {
+                "hits": DynamicModelBuilder._cache_hits,
+                "misses": DynamicModelBuilder._cache_misses,
+                "size": len(DynamicModelBuilder._model_cache),
+                "maxsize": DynamicModelBuilder.cache_maxsize,
+            }
+    
+    @staticmethod
+    def clear_cache():
+        """Drop all cached model classes and reset the counters"""
+        with DynamicModelBuilder._cache_lock:
+            DynamicModelBuilder._model_cache.clear()
+            DynamicModelBuilder._cache_hits = 0
+            DynamicModelBuilder._cache_misses = 0
     
     @staticmethod
     def create_pydantic_model(model_def: ModelDefinition) -> BaseModel:
-        """Create a Pydantic model from ModelDefinition"""
+        """
+        Create a Pydantic model from ModelDefinition.
+        
+        Identical definitions return the same cached class, so the core schema
+        and validator are compiled once rather than on every call.
+        """
+        key = DynamicModelBuilder.definition_hash(model_def)
+        cache = DynamicModelBuilder._model_cache
+        with DynamicModelBuilder._cache_lock:
+            model = cache.get(key)
+            if model is not None:
+                cache.move_to_end(key)
+                DynamicModelBuilder._cache_hits += 1
+                return model
+            DynamicModelBuilder._cache_misses += 1
+        
+        if model_def.has_references():
+            model = DefinitionRegistry([model_def]).get_model(model_def.model_name)
+        else:
+            model = DynamicModelBuilder._build_pydantic_model(model_def)
+        
+        with DynamicModelBuilder._cache_lock:
+            # Keep the first class built if another thread raced us
+            model = cache.setdefault(key, model)
+            cache.move_to_end(key)
+            while len(cache) > DynamicModelBuilder.cache_maxsize:
+                cache.popitem(last=False)
+        return model
+    
+    @staticmethod
+    def _build_pydantic_model(model_def: ModelDefinition) -> BaseModel:
+        """Build a new Pydantic model class from ModelDefinition (uncached)"""
         fields = {}
         
         for field_def in model_def.fields:
@@ -54,45 +229,317 @@ class DynamicModelBuilder:
                 # Required field without default
                 fields[field_def.name] = (
                     python_type, 
-                    Field(description=field_def.description)
+                    Field(description=field_def.description, alias=field_def.alias)
                 )
             elif field_def.default_value is not None:
                 # Field with default value
                 fields[field_def.name] = (
                     python_type, 
-                    Field(default=field_def.default_value, description=field_def.description)
+                    Field(default=field_def.default_value, description=field_def.description, alias=field_def.alias)
                 )
             else:
                 # Optional field
                 fields[field_def.name] = (
                     Optional[python_type], 
-                    Field(default=None, description=field_def.description)
+                    Field(default=None, description=field_def.description, alias=field_def.alias)
                 )
         
+        if any(field_def.alias for field_def in model_def.fields):
+            # Accept the original keys (aliases) as well as the sanitized names
+            return create_model(model_def.model_name, __config__=ConfigDict(populate_by_name=True), **fields)
         return create_model(model_def.model_name, **fields)
         
+    @staticmethod
+    def tool_spec(model: type[BaseModel], provider: str = "openai") -> Dict[str, Any]:
+        """
+        Provider-ready tool spec for model, derived once per class and provider.
+        
+        "openai" returns the OpenAI function tool format and "gemini" returns a
+        Gemini function declaration. Both can be passed straight to
+        llm.bind_tools(...) so repeated binds do no schema conversion. The dict
+        is shared between callers and must not be mutated.
+        
+        Recursive (self-referencing) models are not supported for Gemini: the
+        recursion is cut to an object with no properties, which
+        langchain_google_genai converts to a STRING field (dropping nullable).
+        Flatten such models before using them with Gemini.
+        """
+        specs = _tool_specs.get(model)
+        if specs is not None and provider in specs:
+            return specs[provider]
+        spec = DynamicModelBuilder._build_tool_spec(model, provider)
+        with DynamicModelBuilder._cache_lock:
+            _tool_specs.setdefault(model, {})[provider] = spec
+        return spec
+    
+    @staticmethod
+    def _build_tool_spec(model: type[BaseModel], provider: str) -> Dict[str, Any]:
+        from langchain_core.utils.function_calling import convert_to_openai_tool
+        
+        if provider not in ("openai", "gemini"):
+            raise ValueError(f"Unsupported tool spec provider '{provider}'")
+        openai_tool = convert_to_openai_tool(model)
+        if provider == "openai":
+            return openai_tool
+        function = openai_tool["function"]
+        return {
+            "name": function["name"],
+            "description": function.get("description", ""),
+            "parameters": DynamicModelBuilder._to_gemini_schema(function["parameters"]),
+        }
+    
+    @staticmethod
+    def _to_gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Rewrite a dereferenced JSON schema into Gemini's OpenAPI subset"""
+        any_of = schema.get("anyOf")
+        if any_of is not None:
+            non_null = [option for option in any_of if option.get("type") != "null"]
+            if len(non_null) == 1:
+                # Optional[X] is expressed as X with nullable set
+                merged = {**non_null[0], "nullable": True}
+                if "description" in schema:
+                    merged["description"] = schema["description"]
+                return DynamicModelBuilder._to_gemini_schema(merged)
+        
+        result = {}
+        for key, value in schema.items():
+            if key in GEMINI_UNSUPPORTED_KEYS:
+                continue
+            if key == "properties":
+                value = {name: DynamicModelBuilder._to_gemini_schema(prop) for name, prop in value.items()}
+            elif key == "items":
+                value = DynamicModelBuilder._to_gemini_schema(value)
+            elif key == "anyOf":
+                value = [DynamicModelBuilder._to_gemini_schema(option) for option in value]
+            result[key] = value
+        if "type" not in result and "anyOf" not in result:
+            # Recursive references are cut to an empty schema; Gemini requires a type,
+            # and an object declares its (here: no) properties explicitly
+            result["type"] = "object"
+            result["properties"] = {}
+        return result
+    
+    @staticmethod
+    def _list_adapter(model: type[BaseModel]) -> TypeAdapter:
+        """TypeAdapter(list[model]), compiled once per model class"""
+        adapter = _list_adapters.get(model)
+        if adapter is None:
+            adapter = TypeAdapter(List[model])
+            with DynamicModelBuilder._cache_lock:
+                _list_adapters[model] = adapter
+        return adapter
+    
+    @staticmethod
+    def validate_batch(model: type[BaseModel], records: Union[bytes, str, List[Dict[str, Any]]]) -> BatchValidationResult:
+        """
+        Validate many records against model in one call.
+        
+        records may be a list of dicts or a JSON array as bytes/str, which is
+        parsed and validated directly by pydantic-core. Invalid rows are
+        reported per index without aborting the batch.
+        """
+        adapter = DynamicModelBuilder._list_adapter(model)
+        try:
+            if isinstance(records, (bytes, bytearray, memoryview, str)):
+                instances = adapter.validate_json(records)
+            else:
+                instances = adapter.validate_python(records)
+            return BatchValidationResult(valid=instances, valid_indices=list(range(len(instances))))
+        except ValidationError as e:
+            if isinstance(records, (bytes, bytearray, memoryview, str)):
+                try:
+                    records = json.loads(bytes(records) if isinstance(records, memoryview) else records)
+                except json.JSONDecodeError:
+                    return BatchValidationResult(errors=[RowError(index=-1, errors=e.errors(include_url=False))])
+                if not isinstance(records, list):
+                    return BatchValidationResult(errors=[RowError(index=-1, errors=e.errors(include_url=False))])
+            return DynamicModelBuilder._partition_errors(adapter, records, e)
+    
+    @staticmethod
+    def _partition_errors(adapter: TypeAdapter, records: List[Any], error: ValidationError) -> BatchValidationResult:
+        """Split a failed list validation into valid rows and per-row errors"""
+        row_errors = {}
+        for detail in error.errors(include_url=False):
+            if not detail["loc"] or not isinstance(detail["loc"][0], int):
+                # The input as a whole is not a list of records
+                return BatchValidationResult(errors=[RowError(index=-1, errors=error.errors(include_url=False))])
+            index = detail["loc"][0]
+            detail["loc"] = detail["loc"][1:]
+            row_errors.setdefault(index, []).append(detail)
+        
+        # Re-validate only the rows that passed, still as a single list call
+        valid_indices = [i for i in range(len(records)) if i not in row_errors]
+        valid = adapter.validate_python([records[i] for i in valid_indices])
+        errors = [RowError(index=i, errors=errs) for i, errs in sorted(row_errors.items())]
+        return BatchValidationResult(valid=valid, valid_indices=valid_indices, errors=errors)
+    
+    @staticmethod
+    def validate_jsonl(model: type[BaseModel], lines: Iterable[Union[bytes, str]], chunk_size: int = 1000) -> BatchValidationResult:
+        """
+        Validate a JSONL stream (e.g. an open file) against model.
+        
+        Each line is parsed on its own and the parsed rows are validated in
+        chunks of chunk_size with one list call, so memory stays bounded by
+        the chunk plus the results. Row indices are line
+        numbers (0-based); blank lines are skipped.
+        """
+        result = BatchValidationResult()
+        chunk, chunk_indices = [], []
+        for index, line in enumerate(lines):
+            if isinstance(line, str):
+                line = line.encode()
+            line = line.strip()
+            if not line:
+                continue
+            chunk.append(line)
+            chunk_indices.append(index)
+            if len(chunk) >= chunk_size:
+                DynamicModelBuilder._validate_jsonl_chunk(model, chunk, chunk_indices, result)
+                chunk, chunk_indices = [], []
+        if chunk:
+            DynamicModelBuilder._validate_jsonl_chunk(model, chunk, chunk_indices, result)
+        return result
+    
+    @staticmethod
+    def _validate_jsonl_chunk(model: type[BaseModel], chunk: List[bytes], chunk_indices: List[int], result: BatchValidationResult):
+        # Parse every line on its own so a malformed line can never merge with its neighbours
+        records, record_indices, errors = [], [], {}
+        for line, index in zip(chunk, chunk_indices):
+            try:
+                records.append(json.loads(line))
+                record_indices.append(index)
+            except json.JSONDecodeError:
+                # Let pydantic describe the parse error in its usual format
+                try:
+                    model.model_validate_json(line)
+                except ValidationError as e:
+                    errors[index] = RowError(index=index, errors=e.errors(include_url=False))
+        
+        # Validate the parsed rows in a single list call
+        batch = DynamicModelBuilder.validate_batch(model, records)
+        for row_error in batch.errors:
+            errors[record_indices[row_error.index]] = RowError(index=record_indices[row_error.index], errors=row_error.errors)
+        result.valid.extend(batch.valid)
+        result.valid_indices.extend(record_indices[i] for i in batch.valid_indices)
+        result.errors.extend(errors[index] for index in sorted(errors))
+    
+    @staticmethod
+    def _infer_list_type(values: list) -> FieldType:
+        """Element type of a non-empty list"""
+        # bool is a subclass of int, so it has to be checked first
+        if all(isinstance(v, bool) for v in values):
+            return FieldType.LIST_BOOLEAN
+        if any(isinstance(v, bool) for v in values):
+            return FieldType.LIST_ANY
+        if all(isinstance(v, int) for v in values):
+            return FieldType.LIST_INTEGER
+        if all(isinstance(v, (int, float)) for v in values):
+            return FieldType.LIST_FLOAT
+        if all(isinstance(v, str) for v in values):
+            return FieldType.LIST_STRING
+        return FieldType.LIST_ANY
+    
     @staticmethod
     def _infer_type(value: Any) -> FieldType:
         """Infer FieldType from value"""
-        if isinstance(value, str):
+        # bool is a subclass of int, so it has to be checked first
+        if isinstance(value, bool):
+            return FieldType.BOOLEAN
+        elif isinstance(value, str):
             return FieldType.STRING
         elif isinstance(value, int):
             return FieldType.INTEGER
         elif isinstance(value, float):
             return FieldType.FLOAT
-        elif isinstance(value, bool):
-            return FieldType.BOOLEAN
         elif isinstance(value, list):
-            if value and isinstance(value[0], str):
-                return FieldType.LIST_STRING
-            elif value and isinstance(value[0], int):
-                return FieldType.LIST_INTEGER
-            else:
-                return FieldType.LIST_STRING
+            return DynamicModelBuilder._infer_list_type(value) if value else FieldType.LIST_STRING
         elif isinstance(value, dict):
             return FieldType.DICT
         else:
+            return FieldType.ANY
+    
+    @staticmethod
+    def _unify_types(types: set) -> FieldType:
+        """
+        Collapse the FieldTypes seen for one key into a single type that
+        accepts every observed value, widening to Any on a conflict.
+        """
+        if not types:
             return FieldType.STRING
+        if len(types) == 1:
+            return next(iter(types))
+        if types <= {FieldType.INTEGER, FieldType.FLOAT}:
+            return FieldType.FLOAT
+        if types <= {FieldType.LIST_INTEGER, FieldType.LIST_FLOAT}:
+            return FieldType.LIST_FLOAT
+        list_types = {FieldType.LIST_STRING, FieldType.LIST_INTEGER, FieldType.LIST_FLOAT,
+                      FieldType.LIST_BOOLEAN, FieldType.LIST_ANY}
+        if types <= list_types:
+            return FieldType.LIST_ANY
+        return FieldType.ANY
+    
+    @staticmethod
+    def _field_name(key: str, taken: set) -> str:
+        """A valid, unused pydantic field name for a record key"""
+        name = re.sub(r"\W", "_", key).lstrip("_")
+        # Leading underscores, digits, keywords and BaseModel attributes (model_config, ...) are rejected by pydantic
+        if not name or name[0].isdigit() or keyword.iskeyword(name) or name.startswith("model_") or hasattr(BaseModel, name):
+            name = f"field_{name}"
+        candidate, suffix = name, 1
+        while candidate in taken:
+            suffix += 1
+            candidate = f"{name}_{suffix}"
+        return candidate
+    
+    @staticmethod
+    def infer_model_definition(samples: Iterable[Dict[str, Any]], model_name: str = "InferredModel") -> ModelDefinition:
+        """
+        Infer a ModelDefinition from sample records in a single pass.
+        
+        samples can be any iterable of dicts, e.g. a generator over a JSONL
+        file, and memory stays proportional to the number of distinct keys.
+        A key missing from some rows or holding null becomes optional.
+        Empty lists only mark a key as a list; its element type comes from
+        the non-empty lists seen for it. Keys that are not valid field names
+        (_id, model_config, "first name") get a sanitized name and keep the
+        original key as the field's alias.
+        """
+        total = 0
+        # key -> [observed types, rows present, saw null, saw empty list], in first-seen order
+        stats = {}
+        for sample in samples:
+            total += 1
+            for key, value in sample.items():
+                entry = stats.get(key)
+                if entry is None:
+                    entry = stats[key] = [set(), 0, False, False]
+                entry[1] += 1
+                if value is None:
+                    entry[2] = True
+                elif isinstance(value, list) and not value:
+                    entry[3] = True
+                else:
+                    entry[0].add(DynamicModelBuilder._infer_type(value))
+        
+        fields = []
+        # Keys that are already valid names keep them; the rest are renamed around them
+        taken = {key for key in stats if DynamicModelBuilder._field_name(key, set()) == key}
+        for key, (types, present, saw_null, saw_empty_list) in stats.items():
+            if not types and saw_empty_list:
+                types = {FieldType.LIST_STRING}
+            elif saw_empty_list and not all(t.value.startswith("list_") for t in types):
+                # [] next to non-list values: only Any accepts both
+                types = types | {FieldType.ANY}
+            name = key if key in taken else DynamicModelBuilder._field_name(key, taken)
+            taken.add(name)
+            fields.append(FieldDefinition(
+                name=name,
+                alias=key if name != key else None,
+                type=DynamicModelBuilder._unify_types(types),
+                description=f"{key} (inferred from {total} samples)",
+                required=present == total and not saw_null,
+            ))
+        return ModelDefinition(model_name=model_name, fields=fields)
 
 def main():
     model_definition = '''
@@ -0,0 +1,79 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class QueryResult(BaseModel):
+    index: int = Field(description="Position of the query in the input list")
+    query: str = Field(description="The query that was run")
+    output: Optional[str] = Field(default=None, description="Final answer, if the run succeeded")
+    intermediate_steps: List[Any] = Field(default_factory=list, description="(action, observation) pairs from the agent")
+    error: Optional[str] = Field(default=None, description="Error message, if the run failed")
+    latency: float = Field(description="Wall-clock seconds for this query")
+
+class BatchReport(BaseModel):
+    results: List[QueryResult] = Field(description="Per-query results, in input order")
+    elapsed: float = Field(description="Wall-clock seconds for the whole batch")
+    max_concurrency: int = Field(description="Concurrency cap used")
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.error is None)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.succeeded
+
+    @property
+    def throughput(self) -> float:
+        """Queries completed per second"""
+        return len(self.results) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(r.latency for r in self.results)
+        return {
+            "queries": len(self.results),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_qps": round(self.throughput, 3),
+            "p50_latency_s": round(latencies[len(latencies) // 2], 3) if latencies else 0.0,
+            "max_latency_s": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+async def arun_agent_batch(agent_executor, queries: List[str], max_concurrency: int = 8,
+                           input_key: str = "input", config: Optional[Dict[str, Any]] = None) -> BatchReport:
+    """
+    Run many queries through an agent executor concurrently with ainvoke.
+
+    At most max_concurrency queries are in flight at once. A failing query is
+    recorded with its error instead of stopping the batch. Intermediate steps
+    are collected when the executor was built with
+    return_intermediate_steps=True.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(index: int, query: str) -> QueryResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await agent_executor.ainvoke({input_key: query}, config)
+            except Exception as e:
+                return QueryResult(index=index, query=query, error=f"{type(e).__name__}: {e}",
+                                   latency=time.perf_counter() - start)
+            return QueryResult(
+                index=index,
+                query=query,
+                output=result.get("output"),
+                intermediate_steps=result.get("intermediate_steps", []),
+                latency=time.perf_counter() - start,
+            )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_one(i, q) for i, q in enumerate(queries)))
+    return BatchReport(results=list(results), elapsed=time.perf_counter() - start, max_concurrency=max_concurrency)
+
+def run_agent_batch(agent_executor, queries: List[str], max_concurrency: int = 8,
+                    input_key: str = "input", config: Optional[Dict[str, Any]] = None) -> BatchReport:
+    """Synchronous entry point for arun_agent_batch; starts its own event loop."""
+    return asyncio.run(arun_agent_batch(agent_executor, queries, max_concurrency, input_key, config))
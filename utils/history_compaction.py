@@ -0,0 +1,239 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import patch_config
+
+HANDOFF_TOOL_PREFIX = "transfer_to_"
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and a team of assistants. "
+    "Extend the current summary with the new messages. Keep facts, numbers, results, decisions "
+    "and open requests; drop greetings and small talk. Reply with the updated summary only."
+)
+
+def _is_handoff(name: Optional[str]) -> bool:
+    return bool(name) and name.startswith(HANDOFF_TOOL_PREFIX)
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    return "".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+
+def drop_handoff_noise(messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """
+    Remove swarm handoff chatter: transfer_to_* tool calls and their
+    "Successfully transferred" ToolMessages. An AI message left with no
+    content and no other tool calls is dropped entirely, so the history
+    stays valid (every remaining tool call still has its result).
+    """
+    handoff_ids = set()
+    result = []
+    for message in messages:
+        if isinstance(message, AIMessage) and message.tool_calls:
+            handoffs = [call for call in message.tool_calls if _is_handoff(call["name"])]
+            if handoffs:
+                handoff_ids.update(call["id"] for call in handoffs)
+                remaining = [call for call in message.tool_calls if not _is_handoff(call["name"])]
+                if not remaining and not _text(message.content).strip():
+                    continue
+                additional_kwargs = {
+                    key: value for key, value in message.additional_kwargs.items()
+                    if key not in ("tool_calls", "function_call")
+                }
+                message = message.model_copy(update={"tool_calls": remaining, "additional_kwargs": additional_kwargs})
+        elif isinstance(message, ToolMessage) and (message.tool_call_id in handoff_ids or _is_handoff(message.name)):
+            continue
+        result.append(message)
+    return result
+
+def _transcript(messages: Sequence[BaseMessage]) -> str:
+    lines = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            speaker = "User"
+        elif isinstance(message, AIMessage):
+            speaker = message.name or "Assistant"
+        elif isinstance(message, ToolMessage):
+            speaker = f"Tool {message.name or ''}".strip()
+        else:
+            speaker = message.type
+        text = _text(message.content).strip()
+        if isinstance(message, AIMessage) and message.tool_calls:
+            calls = ", ".join(f"{call['name']}({call['args']})" for call in message.tool_calls)
+            text = f"{text} [calls {calls}]".strip()
+        if text:
+            lines.append(f"{speaker}: {text}")
+    return "\n".join(lines)
+
+class _ThreadSummary(NamedTuple):
+    index: int
+    boundary_id: Optional[str]
+    message: Optional[SystemMessage]
+
+class HistoryCompactor(Runnable):
+    """
+    pre_model_hook for create_react_agent that keeps the model input under
+    a token budget on long threads.
+
+    Handoff tool calls and their ToolMessages are dropped from the input.
+    Once the not-yet-summarized part of the thread exceeds max_tokens, the
+    older messages are folded into a rolling summary (with model) or simply
+    dropped (model=None), keeping roughly the last keep_tokens of
+    conversation verbatim, starting at a user turn. The summary and the
+    position it covers are cached per thread_id, so each call only counts
+    tokens for the recent tail and the summarizer only ever sees new
+    messages. State is left untouched: the trimmed history is returned as
+    llm_input_messages.
+
+    One instance can be shared by all agents of a swarm, since they share
+    the thread's message history. It is a Runnable with a native async
+    path, and summary calls run under the hook's config, so callbacks and
+    tracing see them and ainvoke never blocks the event loop.
+    """
+
+    def __init__(self, model=None, max_tokens: int = 2000, keep_tokens: Optional[int] = None,
+                 drop_handoffs: bool = True, token_counter: Callable[[Sequence[BaseMessage]], int] = count_tokens_approximately,
+                 max_threads: int = 256):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.keep_tokens = keep_tokens if keep_tokens is not None else max_tokens // 2
+        self.drop_handoffs = drop_handoffs
+        self.token_counter = token_counter
+        self.max_threads = max_threads
+        self._lock = threading.Lock()
+        self._summaries: "OrderedDict[Any, _ThreadSummary]" = OrderedDict()
+
+    def _clean(self, messages: Sequence[BaseMessage]) -> List[BaseMessage]:
+        return drop_handoff_noise(messages) if self.drop_handoffs else list(messages)
+
+    def _cached(self, thread_id, messages: Sequence[BaseMessage]) -> _ThreadSummary:
+        with self._lock:
+            entry = self._summaries.get(thread_id)
+            if entry is not None:
+                self._summaries.move_to_end(thread_id)
+        # Only valid if the thread still has the same message at the boundary
+        if entry is None or entry.index > len(messages) or messages[entry.index - 1].id != entry.boundary_id:
+            return _ThreadSummary(0, None, None)
+        return entry
+
+    def _store(self, thread_id, entry: _ThreadSummary):
+        with self._lock:
+            self._summaries[thread_id] = entry
+            self._summaries.move_to_end(thread_id)
+            while len(self._summaries) > self.max_threads:
+                self._summaries.popitem(last=False)
+
+    def _cut_index(self, messages: Sequence[BaseMessage], start: int) -> Optional[int]:
+        """Where the verbatim window begins: the first user turn within the last keep_tokens."""
+        tokens = 0
+        cut = len(messages)
+        while cut > start:
+            tokens += self.token_counter([messages[cut - 1]])
+            if tokens > self.keep_tokens:
+                break
+            cut -= 1
+        for i in range(cut, len(messages)):
+            if isinstance(messages[i], HumanMessage):
+                return i if i > start else None
+        # No user turn inside the window: fall back to the latest one before it
+        for i in range(min(cut, len(messages)) - 1, start, -1):
+            if isinstance(messages[i], HumanMessage):
+                return i
+        return None
+
+    def _summary_prompt(self, summary: Optional[str], messages: Sequence[BaseMessage]) -> Optional[List[BaseMessage]]:
+        transcript = _transcript(messages)
+        if not transcript:
+            return None
+        return [
+            SystemMessage(content=SUMMARY_PROMPT),
+            HumanMessage(content=f"Current summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"),
+        ]
+
+    def summarize(self, summary: Optional[str], messages: Sequence[BaseMessage],
+                  config: Optional[RunnableConfig] = None) -> str:
+        """Fold messages into the running summary with one model call."""
+        prompt = self._summary_prompt(summary, messages)
+        if prompt is None:
+            return summary or ""
+        response = self.model.invoke(prompt, patch_config(config, run_name="history_summary"))
+        return _text(response.content).strip()
+
+    async def asummarize(self, summary: Optional[str], messages: Sequence[BaseMessage],
+                         config: Optional[RunnableConfig] = None) -> str:
+        """Async summarize."""
+        prompt = self._summary_prompt(summary, messages)
+        if prompt is None:
+            return summary or ""
+        response = await self.model.ainvoke(prompt, patch_config(config, run_name="history_summary"))
+        return _text(response.content).strip()
+
+    def _plan(self, messages: Sequence[BaseMessage], thread_id) -> Tuple[_ThreadSummary, Optional[int], List[BaseMessage]]:
+        """(cached entry, cut index or None, messages to send if no new summary is needed)."""
+        entry = self._cached(thread_id, messages)
+        prefix = [entry.message] if entry.message is not None else []
+        recent = self._clean(messages[entry.index:])
+        if self.token_counter(prefix + recent) <= self.max_tokens:
+            return entry, None, prefix + recent
+        return entry, self._cut_index(messages, entry.index), prefix + recent
+
+    def _apply(self, messages: Sequence[BaseMessage], thread_id, cut: int, summary: Optional[str]) -> List[BaseMessage]:
+        summary_message = None
+        if summary:
+            summary_message = SystemMessage(content=f"Summary of the earlier conversation:\n{summary}")
+        self._store(thread_id, _ThreadSummary(cut, messages[cut - 1].id, summary_message))
+        return ([summary_message] if summary_message is not None else []) + self._clean(messages[cut:])
+
+    def compact(self, messages: Sequence[BaseMessage], thread_id=None,
+                config: Optional[RunnableConfig] = None) -> List[BaseMessage]:
+        """The messages to send to the model for this thread."""
+        entry, cut, unchanged = self._plan(messages, thread_id)
+        if cut is None:
+            return unchanged
+        summary = None
+        if self.model is not None:
+            previous = entry.message.content if entry.message is not None else None
+            summary = self.summarize(previous, self._clean(messages[entry.index:cut]), config)
+        return self._apply(messages, thread_id, cut, summary)
+
+    async def acompact(self, messages: Sequence[BaseMessage], thread_id=None,
+                       config: Optional[RunnableConfig] = None) -> List[BaseMessage]:
+        """Async compact: the summary call goes through the model's ainvoke."""
+        entry, cut, unchanged = self._plan(messages, thread_id)
+        if cut is None:
+            return unchanged
+        summary = None
+        if self.model is not None:
+            previous = entry.message.content if entry.message is not None else None
+            summary = await self.asummarize(previous, self._clean(messages[entry.index:cut]), config)
+        return self._apply(messages, thread_id, cut, summary)
+
+    @staticmethod
+    def _thread_id(config: Optional[RunnableConfig]):
+        return (config or {}).get("configurable", {}).get("thread_id")
+
+    def _hook(self, state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        return {"llm_input_messages": self.compact(state["messages"], self._thread_id(config), config)}
+
+    async def _ahook(self, state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        return {"llm_input_messages": await self.acompact(state["messages"], self._thread_id(config), config)}
+
+    def invoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs) -> Dict[str, Any]:
+        return self._call_with_config(self._hook, input, config)
+
+    async def ainvoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs) -> Dict[str, Any]:
+        return await self._acall_with_config(self._ahook, input, config)
+
+    def __call__(self, state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        return self.invoke(state, config)
+
+    def clear(self, thread_id=None):
+        """Forget the cached summary of one thread, or of all threads."""
+        with self._lock:
+            if thread_id is None:
+                self._summaries.clear()
+            else:
+                self._summaries.pop(thread_id, None)
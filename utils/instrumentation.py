@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def _token_usage(response: LLMResult) -> Dict[str, int]:
+    """Prompt/completion tokens from message usage metadata, or the provider's llm_output."""
+    prompt = completion = 0
+    found = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                prompt += usage.get("input_tokens", 0)
+                completion += usage.get("output_tokens", 0)
+                found = True
+    if not found:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt = usage.get("prompt_tokens", 0)
+        completion = usage.get("completion_tokens", 0)
+    return {"prompt_tokens": prompt, "completion_tokens": completion}
+
+class InstrumentationHandler(BaseCallbackHandler):
+    """
+    Callback handler recording where time goes in agent and graph runs.
+
+    Records per-LLM-call latency, time to first token (for streamed calls),
+    prompt/completion tokens, per-tool latency and per-graph-node durations
+    (LangGraph nodes are recognised by their langgraph_node metadata). Every
+    finished span is appended to a JSONL trace file when trace_path is set,
+    and summary() gives in-process latency histograms per span.
+
+    Pass it through the run config: app.invoke(inputs, {"callbacks": [handler]}).
+    """
+
+    def __init__(self, trace_path: Optional[str] = None):
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+        self._starts: Dict[UUID, Dict[str, Any]] = {}
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._ttft: List[float] = []
+        self._tokens = {"prompt_tokens": 0, "completion_tokens": 0}
+        self._trace_file = None
+        if trace_path:
+            directory = os.path.dirname(trace_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._trace_file = open(trace_path, "a", encoding="utf-8")
+
+    # -- span bookkeeping -------------------------------------------------
+
+    def _start(self, run_id: UUID, kind: str, name: str, parent_run_id: Optional[UUID]):
+        with self._lock:
+            self._starts[run_id] = {
+                "kind": kind,
+                "name": name,
+                "start": time.perf_counter(),
+                "started_at": time.time(),
+                "parent_run_id": parent_run_id,
+            }
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **fields):
+        with self._lock:
+            span = self._starts.pop(run_id, None)
+            if span is None:
+                return
+            duration = time.perf_counter() - span["start"]
+            self._durations[f"{span['kind']}:{span['name']}"].append(duration)
+            record = {
+                "kind": span["kind"],
+                "name": span["name"],
+                "run_id": str(run_id),
+                "parent_run_id": str(span["parent_run_id"]) if span["parent_run_id"] else None,
+                "started_at": span["started_at"],
+                "duration_s": duration,
+                "error": repr(error) if error is not None else None,
+                **fields,
+            }
+            if self._trace_file is not None:
+                self._trace_file.write(json.dumps(record, default=str) + "\n")
+                self._trace_file.flush()
+
+    # -- LLM calls --------------------------------------------------------
+
+    def _llm_name(self, serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+        params = kwargs.get("invocation_params") or {}
+        return params.get("model") or params.get("model_name") or (serialized or {}).get("name") or "llm"
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, "llm", self._llm_name(serialized, kwargs), parent_run_id)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, "llm", self._llm_name(serialized, kwargs), parent_run_id)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        with self._lock:
+            span = self._starts.get(run_id)
+            if span is not None and "first_token" not in span:
+                span["first_token"] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs):
+        usage = _token_usage(response)
+        with self._lock:
+            span = self._starts.get(run_id)
+            ttft = None
+            if span is not None and "first_token" in span:
+                ttft = span["first_token"] - span["start"]
+                self._ttft.append(ttft)
+            self._tokens["prompt_tokens"] += usage["prompt_tokens"]
+            self._tokens["completion_tokens"] += usage["completion_tokens"]
+        self._end(run_id, time_to_first_token_s=ttft, **usage)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    # -- tools ------------------------------------------------------------
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(run_id, "tool", name, parent_run_id)
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    # -- graph nodes ------------------------------------------------------
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Only the node's own run, not the runnables nested inside it
+        if node is None or kwargs.get("name") != node:
+            return
+        with self._lock:
+            parent = self._starts.get(parent_run_id)
+        # A subgraph compiled under the node's name (e.g. a swarm agent) reports the same node again
+        if parent is not None and parent["kind"] == "node" and parent["name"] == node:
+            return
+        self._start(run_id, "node", node, parent_run_id)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    # -- reporting --------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Latency histogram (count, mean, p50/p95/p99, max) per span, plus TTFT and token totals."""
+        with self._lock:
+            durations = {key: sorted(values) for key, values in self._durations.items()}
+            ttft = sorted(self._ttft)
+            tokens = dict(self._tokens)
+
+        def stats(values: List[float]) -> Dict[str, float]:
+            return {
+                "count": len(values),
+                "mean_s": sum(values) / len(values) if values else 0.0,
+                "p50_s": _percentile(values, 0.50),
+                "p95_s": _percentile(values, 0.95),
+                "p99_s": _percentile(values, 0.99),
+                "max_s": values[-1] if values else 0.0,
+            }
+
+        return {
+            "spans": {key: stats(values) for key, values in sorted(durations.items())},
+            "time_to_first_token": stats(ttft),
+            "tokens": tokens,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
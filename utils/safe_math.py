@@ -0,0 +1,137 @@
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+Number = Union[int, float]
+
+# Limits that keep a single expression from pinning a CPU or exhausting memory
+MAX_EXPRESSION_LENGTH = 500
+MAX_DEPTH = 50
+MAX_EXPONENT = 10000
+MAX_INT_BITS = 4096
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+def _check_size(value: Number) -> Number:
+    if isinstance(value, complex):
+        # e.g. (-8) ** 0.5; the tools only deal in real numbers
+        raise ValueError("Result is not a real number")
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise ValueError("Result too large")
+    return value
+
+def _safe_mul(a: Number, b: Number) -> Number:
+    if isinstance(a, int) and isinstance(b, int) and a.bit_length() + b.bit_length() > MAX_INT_BITS + 1:
+        raise ValueError("Result too large")
+    return _check_size(a * b)
+
+def _safe_pow(base: Number, exponent: Number) -> Number:
+    if abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"Exponent larger than {MAX_EXPONENT}")
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        # Estimate the size before computing it
+        if exponent * math.log2(abs(base)) > MAX_INT_BITS:
+            raise ValueError("Result too large")
+    try:
+        return _check_size(base ** exponent)
+    except OverflowError:
+        raise ValueError("Result too large")
+
+class CompiledExpression:
+    """
+    An arithmetic expression parsed and validated once, then evaluated as a
+    tree of closures. Only numbers, named variables, + - * / // % ** and
+    unary +/- are accepted; anything else is rejected at compile time.
+    """
+
+    def __init__(self, expression: str):
+        if len(expression) > MAX_EXPRESSION_LENGTH:
+            raise ValueError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError:
+            raise ValueError("Invalid expression")
+        self.expression = expression
+        self.variables = set()
+        self._evaluate = self._compile(tree.body, 0)
+        # Constant expressions are evaluated once and the result reused
+        self._constant = None
+        if not self.variables:
+            self._constant = self._evaluate({})
+
+    def _compile(self, node: ast.AST, depth: int) -> Callable[[Dict[str, Number]], Number]:
+        if depth > MAX_DEPTH:
+            raise ValueError("Expression nested too deeply")
+
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            value = node.value
+            return lambda env: value
+
+        if isinstance(node, ast.Name):
+            name = node.id
+            self.variables.add(name)
+
+            def lookup(env):
+                try:
+                    return env[name]
+                except KeyError:
+                    raise ValueError(f"Unknown variable '{name}'")
+            return lookup
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+            op = _UNARY_OPS[type(node.op)]
+            operand = self._compile(node.operand, depth + 1)
+            return lambda env: op(operand(env))
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            if isinstance(node.op, ast.Pow):
+                op = _safe_pow
+            elif isinstance(node.op, ast.Mult):
+                op = _safe_mul
+            else:
+                op = _BINARY_OPS[type(node.op)]
+            left = self._compile(node.left, depth + 1)
+            right = self._compile(node.right, depth + 1)
+            return lambda env: _check_size(op(left(env), right(env)))
+
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+    def evaluate(self, variables: Optional[Dict[str, Number]] = None) -> Number:
+        if self._constant is not None:
+            return self._constant
+        return self._evaluate(variables or {})
+
+    def evaluate_many(self, inputs: Iterable[Dict[str, Number]]) -> List[Number]:
+        """Evaluate over many variable bindings, reusing the compiled tree."""
+        if self._constant is not None:
+            return [self._constant for _ in inputs]
+        evaluate = self._evaluate
+        return [evaluate(variables) for variables in inputs]
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Parse and validate an expression, caching the result per expression string."""
+    return CompiledExpression(expression)
+
+def evaluate(expression: str, variables: Optional[Dict[str, Number]] = None) -> Number:
+    """Safely evaluate an arithmetic expression; raises ValueError on anything else."""
+    return compile_expression(expression).evaluate(variables)
+
+def evaluate_many(expression: str, inputs: Iterable[Dict[str, Number]]) -> List[Number]:
+    """Evaluate one expression over a list of variable bindings."""
+    return compile_expression(expression).evaluate_many(inputs)
@@ -0,0 +1,489 @@
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(".cache", "checkpoints.sqlite")
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS checkpoints ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "parent_checkpoint_id TEXT, type TEXT, checkpoint BLOB, metadata_type TEXT, metadata BLOB, "
+    "created_at REAL NOT NULL, PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))",
+    # A blob is either a full value (base_version NULL) or the items appended
+    # to the list stored under base_version; depth counts deltas since the last full value
+    "CREATE TABLE IF NOT EXISTS blobs ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, channel TEXT NOT NULL, version TEXT NOT NULL, "
+    "type TEXT NOT NULL, data BLOB, base_version TEXT, depth INTEGER NOT NULL DEFAULT 0, "
+    "PRIMARY KEY (thread_id, checkpoint_ns, channel, version))",
+    "CREATE TABLE IF NOT EXISTS writes ("
+    "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, checkpoint_id TEXT NOT NULL, "
+    "task_id TEXT NOT NULL, idx INTEGER NOT NULL, channel TEXT NOT NULL, type TEXT, value BLOB, "
+    "task_path TEXT NOT NULL DEFAULT '', PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))",
+    "CREATE INDEX IF NOT EXISTS checkpoints_by_thread ON checkpoints (thread_id, created_at)",
+]
+
+class SQLiteCheckpointer(BaseCheckpointSaver[str]):
+    """
+    File-backed LangGraph checkpointer that stores conversation state compactly.
+
+    List-valued channels (the messages list in particular) are stored as
+    deltas: each new version keeps only the items appended since the
+    previous version, with a full snapshot every snapshot_every versions so
+    loading never replays a long chain. Every payload is zlib-compressed.
+    All tables are keyed by thread_id first, so per-thread reads, pruning
+    and deletes are index lookups.
+
+    Retention: keep_last bounds the number of checkpoints kept per thread
+    and namespace (older ones and the blobs only they reference are removed
+    as new ones are written). Subgraph namespaces (a swarm agent writes a
+    fresh one every turn) are dropped whole once they predate every kept
+    root checkpoint, so a thread stays bounded however many turns it runs.
+    prune() does the same on demand and can drop threads idle for longer
+    than max_age seconds.
+
+    Drop-in for InMemorySaver: workflow.compile(checkpointer=SQLiteCheckpointer(path)).
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, *, keep_last: Optional[int] = None,
+                 snapshot_every: int = 20, compression_level: int = 6, serde=None):
+        super().__init__(serde=serde)
+        if keep_last is not None and keep_last < 1:
+            raise ValueError("keep_last must be at least 1")
+        self.path = path
+        self.keep_last = keep_last
+        self.snapshot_every = snapshot_every
+        self.compression_level = compression_level
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Must be set before the first table exists; lets prune() hand pages back to the OS
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        # Last list written per (thread_id, checkpoint_ns, channel): the base for the next delta
+        self._last: "OrderedDict[Tuple[str, str, str], Tuple[str, List[Any], int]]" = OrderedDict()
+        self._last_maxsize = 1024
+
+    # -- serialization ----------------------------------------------------
+
+    def _dump(self, value: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(value)
+        return type_, zlib.compress(data, self.compression_level)
+
+    def _load(self, type_: str, data: bytes) -> Any:
+        return self.serde.loads_typed((type_, zlib.decompress(data)))
+
+    @staticmethod
+    def _extends(previous: List[Any], value: List[Any]) -> bool:
+        if len(value) < len(previous):
+            return False
+        return all(a is b or a == b for a, b in zip(previous, value))
+
+    def _dump_blob(self, key: Tuple[str, str, str], version: str, value: Any) -> Tuple[str, bytes, Optional[str], int]:
+        """Serialize a channel value, as a delta against the previous version when it only appends."""
+        if not isinstance(value, list):
+            self._last.pop(key, None)
+            return (*self._dump(value), None, 0)
+        previous = self._last.get(key)
+        if previous is not None and previous[2] < self.snapshot_every and self._extends(previous[1], value):
+            base_version, base_value, depth = previous
+            type_, data = self._dump(value[len(base_value):])
+            stored = (type_, data, base_version, depth + 1)
+        else:
+            stored = (*self._dump(value), None, 0)
+        self._last[key] = (version, list(value), stored[3])
+        self._last.move_to_end(key)
+        while len(self._last) > self._last_maxsize:
+            self._last.popitem(last=False)
+        return stored
+
+    def _load_blob(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Tuple[bool, Any]:
+        """Rebuild one channel value by walking its delta chain back to the last full snapshot."""
+        chain = []
+        current = version
+        while current is not None:
+            row = self._conn.execute(
+                "SELECT type, data, base_version FROM blobs "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+                (thread_id, checkpoint_ns, channel, current),
+            ).fetchone()
+            if row is None:
+                if chain:
+                    raise ValueError(f"Delta base {current} of channel '{channel}' is missing")
+                return False, None
+            chain.append(row)
+            current = row[2]
+        type_, data, _ = chain.pop()
+        if type_ == "empty":
+            return False, None
+        value = self._load(type_, data)
+        for type_, data, _ in reversed(chain):
+            value = list(value) + list(self._load(type_, data))
+        return True, value
+
+    def _load_channel_values(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        values = {}
+        for channel, version in versions.items():
+            found, value = self._load_blob(thread_id, checkpoint_ns, channel, str(version))
+            if found:
+                values[channel] = value
+        return values
+
+    def _pending_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> List[Tuple[str, str, Any]]:
+        rows = self._conn.execute(
+            "SELECT task_id, idx, channel, type, value, task_path FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        # Same order as the in-memory saver: by task path, then task, then write index
+        rows.sort(key=lambda row: (row[5], row[0], row[1]))
+        return [(task_id, channel, self._load(type_, value)) for task_id, _, channel, type_, value, _ in rows]
+
+    def _tuple(self, row) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type_, data, metadata_type, metadata = row
+        checkpoint = self._load(type_, data)
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+            }},
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(thread_id, checkpoint_ns, checkpoint["channel_versions"]),
+            },
+            metadata=self._load(metadata_type, metadata),
+            parent_config=(
+                {"configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_checkpoint_id,
+                }}
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=self._pending_writes(thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    # -- BaseCheckpointSaver ----------------------------------------------
+
+    _COLUMNS = ("SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "type, checkpoint, metadata_type, metadata FROM checkpoints ")
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._conn.execute(
+                    self._COLUMNS + "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    self._COLUMNS + "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._tuple(row) if row is not None else None
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config is not None:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(self._COLUMNS + where + "ORDER BY checkpoint_id DESC", params).fetchall()
+        for row in rows:
+            if limit is not None and limit <= 0:
+                break
+            with self._lock:
+                if filter:
+                    metadata = self._load(row[6], row[7])
+                    if not all(metadata.get(key) == value for key, value in filter.items()):
+                        continue
+                checkpoint_tuple = self._tuple(row)
+            if limit is not None:
+                limit -= 1
+            yield checkpoint_tuple
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+            new_versions: ChannelVersions) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        c = checkpoint.copy()
+        values = c.pop("channel_values")
+        with self._lock:
+            blobs = []
+            for channel, version in new_versions.items():
+                version = str(version)
+                if channel in values:
+                    stored = self._dump_blob((thread_id, checkpoint_ns, channel), version, values[channel])
+                else:
+                    self._last.pop((thread_id, checkpoint_ns, channel), None)
+                    stored = ("empty", None, None, 0)
+                blobs.append((thread_id, checkpoint_ns, channel, version, *stored))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO blobs (thread_id, checkpoint_ns, channel, version, type, data, base_version, depth) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                blobs,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+                "type, checkpoint, metadata_type, metadata, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    *self._dump(c),
+                    *self._dump(get_checkpoint_metadata(config, metadata)),
+                    time.time(),
+                ),
+            )
+            if self.keep_last is not None:
+                self._trim(thread_id, checkpoint_ns, self.keep_last, slack=self.keep_last)
+            self._conn.commit()
+        return {"configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"],
+        }}
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                   task_path: str = "") -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # Special writes (errors, interrupts) replace earlier ones; regular writes are kept once
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+        with self._lock:
+            self._conn.executemany(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (thread_id, checkpoint_ns, checkpoint_id, task_id, WRITES_IDX_MAP.get(channel, idx),
+                     channel, *self._dump(value), task_path)
+                    for idx, (channel, value) in enumerate(writes)
+                ],
+            )
+            self._conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("checkpoints", "blobs", "writes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self._forget(thread_id)
+            self._conn.commit()
+
+    def get_next_version(self, current: Optional[str], channel: None = None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None):
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata,
+                   new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str,
+                          task_path: str = "") -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # -- retention --------------------------------------------------------
+
+    def _forget(self, thread_id: str):
+        for key in [key for key in self._last if key[0] == thread_id]:
+            del self._last[key]
+
+    def _trim(self, thread_id: str, checkpoint_ns: str, keep_last: int, slack: int = 0) -> int:
+        """Drop all but the newest keep_last checkpoints of one namespace, once more than keep_last + slack exist."""
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+            (thread_id, checkpoint_ns),
+        ).fetchone()[0]
+        if count <= keep_last + slack:
+            return 0
+        kept = self._conn.execute(
+            "SELECT checkpoint_id, type, checkpoint, created_at FROM checkpoints "
+            "WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT ?",
+            (thread_id, checkpoint_ns, keep_last),
+        ).fetchall()
+        oldest_kept = kept[-1][0]
+        dropped = count - len(kept)
+        if checkpoint_ns == "":
+            dropped += self._drop_superseded(thread_id, kept[-1][3])
+        self._conn.execute(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            (thread_id, checkpoint_ns, oldest_kept),
+        )
+        self._conn.execute(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?",
+            (thread_id, checkpoint_ns, oldest_kept),
+        )
+
+        # Keep every blob a surviving checkpoint references, plus the delta chains they are built on
+        needed = set()
+        for _, type_, data, _ in kept:
+            needed.update((channel, str(version)) for channel, version in self._load(type_, data)["channel_versions"].items())
+        bases = {
+            (channel, version): base_version
+            for channel, version, base_version in self._conn.execute(
+                "SELECT channel, version, base_version FROM blobs WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            )
+        }
+        # The next delta may build on the last written list, so never collect it
+        needed.update(
+            (key[2], version) for key, (version, _, _) in self._last.items()
+            if key[0] == thread_id and key[1] == checkpoint_ns
+        )
+        pending = list(needed)
+        while pending:
+            channel, version = pending.pop()
+            base_version = bases.get((channel, version))
+            if base_version is not None and (channel, base_version) not in needed:
+                needed.add((channel, base_version))
+                pending.append((channel, base_version))
+        self._conn.executemany(
+            "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?",
+            [(thread_id, checkpoint_ns, channel, version) for channel, version in bases.keys() - needed],
+        )
+        return dropped
+
+    def _drop_superseded(self, thread_id: str, before: float) -> int:
+        """Drop subgraph namespaces whose last checkpoint predates the oldest kept root checkpoint."""
+        superseded = [
+            checkpoint_ns for (checkpoint_ns,) in self._conn.execute(
+                "SELECT checkpoint_ns FROM checkpoints WHERE thread_id = ? AND checkpoint_ns != '' "
+                "GROUP BY checkpoint_ns HAVING MAX(created_at) < ?",
+                (thread_id, before),
+            )
+        ]
+        if not superseded:
+            return 0
+        dropped = 0
+        for checkpoint_ns in superseded:
+            dropped += self._conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?", (thread_id, checkpoint_ns)
+            ).rowcount
+            for table in ("blobs", "writes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ?", (thread_id, checkpoint_ns))
+        for key in [key for key in self._last if key[0] == thread_id and key[1] in superseded]:
+            del self._last[key]
+        return dropped
+
+    def prune(self, thread_ids: Optional[Sequence[str]] = None, *, strategy: str = "keep_latest",
+              keep_last: int = 1, max_age: Optional[float] = None) -> int:
+        """
+        Remove old checkpoints and return how many were deleted.
+
+        strategy="keep_latest" keeps the newest keep_last checkpoints of each
+        thread and namespace; strategy="delete" removes the threads entirely.
+        With max_age, threads whose newest checkpoint is older than max_age
+        seconds are removed entirely as well. thread_ids=None covers every
+        thread in the file.
+        """
+        if strategy not in ("keep_latest", "delete"):
+            raise ValueError(f"Unknown prune strategy '{strategy}'")
+        with self._lock:
+            if thread_ids is None:
+                thread_ids = [row[0] for row in self._conn.execute("SELECT DISTINCT thread_id FROM checkpoints")]
+            deleted = 0
+            for thread_id in thread_ids:
+                newest = self._conn.execute(
+                    "SELECT COUNT(*), MAX(created_at) FROM checkpoints WHERE thread_id = ?", (thread_id,)
+                ).fetchone()
+                expired = max_age is not None and newest[1] is not None and time.time() - newest[1] > max_age
+                if strategy == "delete" or expired:
+                    for table in ("checkpoints", "blobs", "writes"):
+                        self._conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+                    self._forget(thread_id)
+                    deleted += newest[0]
+                    continue
+                namespaces = self._conn.execute(
+                    "SELECT DISTINCT checkpoint_ns FROM checkpoints WHERE thread_id = ?", (thread_id,)
+                ).fetchall()
+                for (checkpoint_ns,) in namespaces:
+                    deleted += self._trim(thread_id, checkpoint_ns, keep_last)
+            self._conn.commit()
+            self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Row counts and stored (compressed) bytes, for seeing how much a thread costs on disk."""
+        with self._lock:
+            checkpoints, threads = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT thread_id) FROM checkpoints"
+            ).fetchone()
+            blobs, deltas, blob_bytes = self._conn.execute(
+                "SELECT COUNT(*), COUNT(base_version), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+            writes = self._conn.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+        return {
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "blobs": blobs,
+            "delta_blobs": deltas,
+            "blob_bytes": blob_bytes,
+            "writes": writes,
+            "file_bytes": sum(os.path.getsize(p) for p in (self.path, self.path + "-wal") if os.path.exists(p)),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
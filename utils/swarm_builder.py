@@ -0,0 +1,125 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from langchain_core.messages import SystemMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.tools import BaseTool, tool as as_tool
+from langgraph.graph import StateGraph
+from langgraph.prebuilt import create_react_agent
+from langgraph_swarm import SwarmState, add_active_agent_router
+from langgraph_swarm.handoff import METADATA_KEY_HANDOFF_DESTINATION
+
+class SwarmAgentSpec:
+    """What it takes to build one swarm agent; nothing is constructed until it is first needed."""
+
+    def __init__(self, name: str, prompt: str, tools: Sequence[Any]):
+        self.name = name
+        # Sorted once so the serialized tool block is byte-identical on every call and every restart
+        self.tools: List[BaseTool] = sorted(
+            (t if isinstance(t, BaseTool) else as_tool(t) for t in tools), key=lambda t: t.name
+        )
+        self.system_message = SystemMessage(content=prompt)
+        self.handoff_destinations = [
+            t.metadata[METADATA_KEY_HANDOFF_DESTINATION]
+            for t in self.tools
+            if t.metadata and METADATA_KEY_HANDOFF_DESTINATION in t.metadata
+        ]
+
+class _LazyAgentNode(Runnable):
+    """
+    Swarm node that compiles its agent on first call and then hands the call
+    straight to it. It starts no run of its own, so tracing and callbacks see
+    the same single agent run per turn as with create_swarm.
+    """
+
+    def __init__(self, builder: "SwarmBuilder", name: str):
+        self.builder = builder
+        self.name = name
+
+    def invoke(self, input, config: Optional[RunnableConfig] = None, **kwargs):
+        return self.builder.agent(self.name).invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config: Optional[RunnableConfig] = None, **kwargs):
+        return await self.builder.agent(self.name).ainvoke(input, config, **kwargs)
+
+class SwarmBuilder:
+    """
+    Builds a langgraph_swarm graph whose agents share one model instance
+    and are constructed lazily.
+
+    Each agent's model is bound to its tools once (bound_model) and reused
+    by every call. The model input is always laid out as: the agent's fixed
+    system prompt, then the conversation, appended to in place. The tool
+    block comes from a name-sorted tool list. This keeps the request prefix
+    byte-stable from turn to turn, which is what provider-side prompt/context
+    caching (DeepSeek context caching, Gemini implicit caching) keys on. A
+    pre_model_hook such as HistoryCompactor slots its summary in right after
+    the system prompt, where it only changes when history is compacted.
+
+    Agents are compiled on first use (the default agent on the first turn,
+    the others on their first handoff), so building the swarm costs no
+    more than registering specs.
+
+        swarm = SwarmBuilder(model)
+        swarm.add_agent("Alice", "You are Alice...", [add, create_handoff_tool(agent_name="Bob")])
+        swarm.add_agent("Bob", "You are Bob...", [create_handoff_tool(agent_name="Alice")])
+        app = swarm.build(default_active_agent="Alice").compile(checkpointer=InMemorySaver())
+    """
+
+    def __init__(self, model, pre_model_hook: Optional[Callable] = None):
+        self.model = model
+        self.pre_model_hook = pre_model_hook
+        self.specs: Dict[str, SwarmAgentSpec] = {}
+        self._lock = threading.RLock()
+        self._bound: Dict[str, Any] = {}
+        self._agents: Dict[str, Any] = {}
+
+    def add_agent(self, name: str, prompt: str, tools: Sequence[Any] = ()) -> "SwarmBuilder":
+        with self._lock:
+            self.specs[name] = SwarmAgentSpec(name, prompt, tools)
+            self._bound.pop(name, None)
+            self._agents.pop(name, None)
+        return self
+
+    def bound_model(self, name: str):
+        """The shared model bound to this agent's tools, computed once."""
+        with self._lock:
+            if name not in self._bound:
+                spec = self.specs[name]
+                self._bound[name] = self.model.bind_tools(spec.tools) if spec.tools else self.model
+            return self._bound[name]
+
+    def agent(self, name: str):
+        """The compiled agent, built on first use."""
+        with self._lock:
+            if name not in self._agents:
+                spec = self.specs[name]
+                system_message = spec.system_message
+
+                # Runs after pre_model_hook, so messages is already the compacted history
+                def prompt(state) -> list:
+                    return [system_message, *state["messages"]]
+
+                self._agents[name] = create_react_agent(
+                    self.bound_model(name),
+                    spec.tools,
+                    prompt=prompt,
+                    name=name,
+                    pre_model_hook=self.pre_model_hook,
+                )
+            return self._agents[name]
+
+    def built_agents(self) -> List[str]:
+        """Names of the agents compiled so far."""
+        with self._lock:
+            return list(self._agents)
+
+    def build(self, default_active_agent: str, state_schema=SwarmState) -> StateGraph:
+        """The swarm graph, equivalent to create_swarm over all registered agents."""
+        names = list(self.specs)
+        if default_active_agent not in names:
+            raise ValueError(f"Default active agent '{default_active_agent}' not found in agent names {names}")
+        builder = StateGraph(state_schema)
+        add_active_agent_router(builder, route_to=names, default_active_agent=default_active_agent)
+        for name in names:
+            builder.add_node(name, _LazyAgentNode(self, name), destinations=tuple(self.specs[name].handoff_destinations))
+        return builder
@@ -1,53 +1,424 @@
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, InvalidToken
 import base64
 import argparse
+import csv
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Optional, Tuple
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.exceptions import InvalidTag
+
+# Salt used by tokens written before the salt was stored in the token header
+LEGACY_SALT = b'salt_1234567890'
+DEFAULT_ITERATIONS = 100000
+# Iteration counts read from a token header must fall in this range, so a
+# crafted header cannot make decryption run PBKDF2 for minutes
+MAX_ITERATIONS = 2000000
+SALT_SIZE = 16
+
+# Token header: magic, 16-byte salt, big-endian iteration count
+TOKEN_MAGIC = b'SKE1'
+HEADER_FORMAT = '>4s16sI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Stream header: magic, salt (zeros for random keys), iterations, chunk size, nonce prefix
+STREAM_MAGIC = b'SKS1'
+STREAM_HEADER_FORMAT = '>4s16sII8s'
+STREAM_HEADER_SIZE = struct.calcsize(STREAM_HEADER_FORMAT)
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Each frame is a u32 length whose top bit marks the final chunk
+FRAME_FINAL_FLAG = 0x80000000
+
+# Keyring token header: magic, key ID length, then the UTF-8 key ID
+KEYRING_MAGIC = b'SKK1'
+
+# Rows handed to the process pool at a time by the batch CLI
+BATCH_BLOCK_SIZE = 10000
+
+# Process-local cache of derived keys, keyed by (password hash, salt, iterations)
+KEY_CACHE_SIZE = 128
+_key_cache = OrderedDict()
+_key_cache_lock = threading.Lock()
+
+
+def _valid_chunk_size(chunk_size: int) -> bool:
+    return 0 < chunk_size < FRAME_FINAL_FLAG - 16
+
+
+def derive_key(password: bytes, salt: bytes, iterations: int = DEFAULT_ITERATIONS) -> bytes:
+    """
+    Derive a Fernet key from a password using PBKDF2, reusing a cached
+    result when the same (password, salt, iterations) was derived before.
+    """
+    cache_key = (hashlib.sha256(password).digest(), salt, iterations)
+    with _key_cache_lock:
+        key = _key_cache.get(cache_key)
+        if key is not None:
+            _key_cache.move_to_end(cache_key)
+            return key
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(password))
+
+    with _key_cache_lock:
+        _key_cache[cache_key] = key
+        while len(_key_cache) > KEY_CACHE_SIZE:
+            _key_cache.popitem(last=False)
+    return key
+
+
+def clear_key_cache():
+    """
+    Drop all cached derived keys.
+    """
+    with _key_cache_lock:
+        _key_cache.clear()
+
+
+# Encryptor rebuilt once in each pool worker by _init_worker
+_worker_encryptor = None
+
+
+def _init_worker(state: tuple):
+    global _worker_encryptor
+    _worker_encryptor = SymmetricKeyEncryption._from_state(state)
+
+
+def _worker_call(method: str, item: str, return_exceptions: bool):
+    try:
+        return getattr(_worker_encryptor, method)(item)
+    except Exception as e:
+        if return_exceptions:
+            return e
+        raise
+
 
 class SymmetricKeyEncryption:
-    def __init__(self, password: str = None):
+    def __init__(self, password: str = None, salt: bytes = None, iterations: int = DEFAULT_ITERATIONS):
         """
         Initialize the encryption class with a password-based key derivation
         or generate a random key.
+
+        Password-based instances use a random per-instance salt (unless one is
+        given) that is written into every token header, so tokens encrypted by
+        other instances with the same password can still be decrypted. Key
+        derivation is deferred until the key is first needed.
         """
+        if salt is not None and len(salt) != SALT_SIZE:
+            # The token header has room for exactly SALT_SIZE bytes
+            raise ValueError(f"salt must be {SALT_SIZE} bytes")
+        self.iterations = iterations
+        self._token_header = None
         if password:
-            self.key = self._derive_key_from_password(password)
+            self._password = password.encode()
+            self.salt = salt or os.urandom(SALT_SIZE)
+            self._key = None
+            self._cipher_suite = None
         else:
-            self.key = Fernet.generate_key()
-        
-        self.cipher_suite = Fernet(self.key)
-    
-    def _derive_key_from_password(self, password: str) -> bytes:
+            self._password = None
+            self.salt = None
+            self._key = Fernet.generate_key()
+            self._cipher_suite = Fernet(self._key)
+
+    @property
+    def key(self) -> bytes:
+        if self._key is None:
+            self._key = self._derive_key_from_password(self.salt, self.iterations)
+        return self._key
+
+    @property
+    def cipher_suite(self) -> Fernet:
+        if self._cipher_suite is None:
+            self._cipher_suite = Fernet(self.key)
+        return self._cipher_suite
+
+    def _state(self) -> tuple:
         """
-        Derive a key from a password using PBKDF2.
+        Picklable snapshot, including the derived key, for rebuilding in workers.
         """
-        # Use a salt (in production, store this securely)
-        salt = b'salt_1234567890'  # In production, use os.urandom(16)
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return key
-    
+        return (self._password, self.salt, self.iterations, self.key)
+
+    @classmethod
+    def _from_state(cls, state: tuple) -> 'SymmetricKeyEncryption':
+        password, salt, iterations, key = state
+        instance = cls.__new__(cls)
+        instance._password = password
+        instance.salt = salt
+        instance.iterations = iterations
+        instance._key = key
+        instance._cipher_suite = Fernet(key)
+        instance._token_header = None
+        if password is not None:
+            # Seed the worker's cache so the instance key is never re-derived
+            with _key_cache_lock:
+                _key_cache[(hashlib.sha256(password).digest(), salt, iterations)] = key
+        return instance
+
+    def process_pool(self, workers: int = None) -> ProcessPoolExecutor:
+        """
+        Process pool whose workers each receive this instance's derived key
+        once at start-up. Pass it to encrypt_many/decrypt_many to reuse it
+        across calls.
+        """
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self._state(),))
+
+    def _map(self, method: str, items, workers: int, chunksize: int, executor, return_exceptions: bool) -> list:
+        items = list(items)
+        if executor is None and (workers == 1 or len(items) < chunksize):
+            # Not worth a pool: run inline in this process
+            results = []
+            for item in items:
+                try:
+                    results.append(getattr(self, method)(item))
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+            return results
+        if executor is not None:
+            return list(executor.map(_worker_call, [method] * len(items), items,
+                                     [return_exceptions] * len(items), chunksize=chunksize))
+        with self.process_pool(workers) as pool:
+            return list(pool.map(_worker_call, [method] * len(items), items,
+                                 [return_exceptions] * len(items), chunksize=chunksize))
+
+    def encrypt_many(self, items, workers: int = None, chunksize: int = 256, executor=None,
+                     return_exceptions: bool = False) -> list:
+        """
+        Encrypt many strings across a process pool, preserving input order.
+
+        With return_exceptions=True a failing item yields its exception instead
+        of aborting the batch. Small inputs are processed inline.
+        """
+        return self._map('encrypt_data', items, workers, chunksize, executor, return_exceptions)
+
+    def decrypt_many(self, items, workers: int = None, chunksize: int = 256, executor=None,
+                     return_exceptions: bool = False) -> list:
+        """
+        Decrypt many tokens across a process pool, preserving input order.
+
+        With return_exceptions=True a bad token yields its exception instead of
+        aborting the batch. Small inputs are processed inline.
+        """
+        return self._map('decrypt_data', items, workers, chunksize, executor, return_exceptions)
+
+    def _derive_key_from_password(self, salt: bytes, iterations: int) -> bytes:
+        """
+        Derive a key from the instance password using PBKDF2.
+        """
+        return derive_key(self._password, salt, iterations)
+
+    def _check_iterations(self, iterations: int):
+        """
+        Reject an iteration count read from a token header unless it is this
+        instance's own or within DEFAULT_ITERATIONS..MAX_ITERATIONS.
+        """
+        if iterations != self.iterations and not DEFAULT_ITERATIONS <= iterations <= MAX_ITERATIONS:
+            raise InvalidToken
+
+    def _header(self) -> bytes:
+        """
+        Token header carrying the salt and iteration count (password mode only).
+        """
+        if self._password is None:
+            return b''
+        if self._token_header is None:
+            self._token_header = struct.pack(HEADER_FORMAT, TOKEN_MAGIC, self.salt, self.iterations)
+        return self._token_header
+
+    def _cipher_for_token(self, token):
+        """
+        Split a raw token (bytes or memoryview) into (cipher, fernet_token)
+        using its header. The header is parsed in place without copying.
+        """
+        if self._password is None:
+            return self.cipher_suite, token
+        if token[:len(TOKEN_MAGIC)] == TOKEN_MAGIC:
+            _, salt, iterations = struct.unpack_from(HEADER_FORMAT, token)
+            fernet_token = token[HEADER_SIZE:]
+        else:
+            # Token from before salts were stored in the header
+            salt, iterations, fernet_token = LEGACY_SALT, DEFAULT_ITERATIONS, token
+        if salt == self.salt and iterations == self.iterations:
+            return self.cipher_suite, fernet_token
+        self._check_iterations(iterations)
+        return Fernet(self._derive_key_from_password(salt, iterations)), fernet_token
+
+    def encrypt_bytes(self, data) -> bytes:
+        """
+        Encrypt a bytes-like object (bytes, bytearray, memoryview) and return
+        the raw token: the salt header followed by the Fernet token, without
+        an extra base64 layer.
+        """
+        if not isinstance(data, bytes):
+            # Fernet only accepts bytes; this is the single copy for buffers
+            data = bytes(data)
+        header = self._header()
+        token = self.cipher_suite.encrypt(data)
+        return header + token if header else token
+
+    def decrypt_bytes(self, token) -> bytes:
+        """
+        Decrypt a raw token from encrypt_bytes. Accepts bytes, bytearray or
+        memoryview and returns the plaintext bytes.
+        """
+        if not isinstance(token, (bytes, memoryview)):
+            token = memoryview(token)
+        cipher_suite, fernet_token = self._cipher_for_token(token)
+        if isinstance(fernet_token, memoryview):
+            fernet_token = fernet_token.tobytes()
+        return cipher_suite.decrypt(fernet_token)
+
     def encrypt_data(self, data: str) -> str:
         """
         Encrypt the given data (string) and return encrypted string.
         """
-        encrypted_data = self.cipher_suite.encrypt(data.encode())
-        return base64.urlsafe_b64encode(encrypted_data).decode()
+        return base64.urlsafe_b64encode(self.encrypt_bytes(data.encode())).decode()
     
     def decrypt_data(self, encrypted_data: str) -> str:
         """
         Decrypt the given encrypted data and return original string.
         """
-        encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode())
-        decrypted_data = self.cipher_suite.decrypt(encrypted_bytes)
-        return decrypted_data.decode()
+        return self.decrypt_bytes(base64.urlsafe_b64decode(encrypted_data)).decode()
     
+    def _stream_cipher(self, salt: bytes, iterations: int) -> AESGCM:
+        """
+        AES-256-GCM cipher for streams, keyed by HKDF over the Fernet key.
+        """
+        if self._password is None:
+            key = self.key
+        else:
+            key = self._derive_key_from_password(salt, iterations)
+        stream_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'symmetric_encryption stream v1',
+        ).derive(base64.urlsafe_b64decode(key))
+        return AESGCM(stream_key)
+
+    def encrypt_stream(self, src, dst, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Encrypt a binary stream into a framed format of authenticated chunks.
+
+        Memory use is bounded by chunk_size. Each chunk is bound to the header,
+        its position and whether it is the last one, so reordered, dropped or
+        truncated chunks fail to decrypt. Returns the number of plaintext bytes.
+        """
+        if not _valid_chunk_size(chunk_size):
+            raise ValueError("chunk_size out of range")
+        if self._password is None:
+            salt, iterations = bytes(SALT_SIZE), 0
+        else:
+            salt, iterations = self.salt, self.iterations
+        nonce_prefix = os.urandom(8)
+        header = struct.pack(STREAM_HEADER_FORMAT, STREAM_MAGIC, salt, iterations, chunk_size, nonce_prefix)
+        cipher = self._stream_cipher(salt, iterations)
+        dst.write(header)
+
+        total = 0
+        counter = 0
+        chunk = src.read(chunk_size)
+        while True:
+            # Read one chunk ahead so the last frame can be flagged as final
+            next_chunk = src.read(chunk_size) if chunk else b''
+            final = not next_chunk
+            aad = header + struct.pack('>I?', counter, final)
+            encrypted = cipher.encrypt(nonce_prefix + struct.pack('>I', counter), chunk, aad)
+            length = len(encrypted) | (FRAME_FINAL_FLAG if final else 0)
+            dst.write(struct.pack('>I', length))
+            dst.write(encrypted)
+            total += len(chunk)
+            if final:
+                return total
+            chunk = next_chunk
+            counter += 1
+
+    def decrypt_stream(self, src, dst) -> int:
+        """
+        Decrypt a stream written by encrypt_stream. Returns the number of
+        plaintext bytes; raises InvalidToken on tampered or truncated input.
+        """
+        header = src.read(STREAM_HEADER_SIZE)
+        if len(header) != STREAM_HEADER_SIZE:
+            raise InvalidToken
+        magic, salt, iterations, chunk_size, nonce_prefix = struct.unpack(STREAM_HEADER_FORMAT, header)
+        if magic != STREAM_MAGIC or not _valid_chunk_size(chunk_size):
+            raise InvalidToken
+        if self._password is not None:
+            self._check_iterations(iterations)
+        cipher = self._stream_cipher(salt, iterations)
+
+        total = 0
+        counter = 0
+        while True:
+            prefix = src.read(4)
+            if len(prefix) != 4:
+                # Stream ended before the final frame
+                raise InvalidToken
+            (length,) = struct.unpack('>I', prefix)
+            final = bool(length & FRAME_FINAL_FLAG)
+            length &= ~FRAME_FINAL_FLAG
+            if length > chunk_size + 16:
+                raise InvalidToken
+            encrypted = src.read(length)
+            if len(encrypted) != length:
+                raise InvalidToken
+            aad = header + struct.pack('>I?', counter, final)
+            try:
+                chunk = cipher.decrypt(nonce_prefix + struct.pack('>I', counter), encrypted, aad)
+            except InvalidTag:
+                raise InvalidToken
+            dst.write(chunk)
+            total += len(chunk)
+            if final:
+                if src.read(1):
+                    # Trailing data after the final frame
+                    raise InvalidToken
+                return total
+            counter += 1
+
+    def encrypt_file(self, input_path: str, output_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Encrypt a file in constant memory. Returns the number of plaintext bytes.
+        """
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+            return self.encrypt_stream(src, dst, chunk_size)
+
+    def decrypt_file(self, input_path: str, output_path: str) -> int:
+        """
+        Decrypt a file written by encrypt_file. Returns the number of plaintext bytes.
+
+        Plaintext goes to a temporary file next to output_path that replaces
+        it only once the final frame has verified, so a tampered or truncated
+        input never leaves partial plaintext behind.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix='.tmp')
+        try:
+            # Wrap the fd first so it is closed even if the input cannot be opened
+            with os.fdopen(fd, 'wb') as dst, open(input_path, 'rb') as src:
+                total = self.decrypt_stream(src, dst)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return total
+
     def get_key(self) -> str:
         """
         Get the encryption key as a base64 string.
@@ -55,16 +426,291 @@ class SymmetricKeyEncryption:
         return base64.urlsafe_b64encode(self.key).decode()
 
 
+class MigrationProgress:
+    """
+    Counters for a background re-encryption started by KeyRing.migrate.
+    """
+
+    def __init__(self):
+        self.scanned = 0
+        self.rotated = 0
+        self.failed = 0
+        self.error = None
+        self._thread = None
+
+    @property
+    def done(self) -> bool:
+        return self._thread is not None and not self._thread.is_alive()
+
+    def join(self, timeout: float = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class KeyRing:
+    """
+    Several SymmetricKeyEncryption keys addressed by key ID.
+
+    Tokens carry the ID of the key that wrote them, so decryption is a single
+    dict lookup however many retired keys are kept, and only the primary key
+    is used to encrypt. Rotating means adding a new primary key; old tokens
+    keep decrypting and can be re-encrypted lazily on read (decrypt_and_rotate)
+    or in the background (migrate).
+    """
+
+    def __init__(self, legacy_key_id: str = None):
+        self._keys = {}
+        self.primary_id = None
+        # Key used for tokens written without a keyring header, if any
+        self.legacy_key_id = legacy_key_id
+
+    def add_key(self, key_id: str, encryptor: SymmetricKeyEncryption, primary: bool = False):
+        """
+        Register an encryptor under key_id. The first key added becomes primary.
+        """
+        if len(key_id.encode()) > 255:
+            raise ValueError("key_id must be at most 255 bytes")
+        if key_id in self._keys:
+            raise ValueError(f"Key ID already registered: {key_id}")
+        self._keys[key_id] = encryptor
+        if primary or self.primary_id is None:
+            self.primary_id = key_id
+
+    def add_password(self, key_id: str, password: str, primary: bool = False):
+        """
+        Register a password-derived key under key_id.
+        """
+        self.add_key(key_id, SymmetricKeyEncryption(password), primary)
+
+    def set_primary(self, key_id: str):
+        if key_id not in self._keys:
+            raise KeyError(key_id)
+        self.primary_id = key_id
+
+    def remove_key(self, key_id: str):
+        """
+        Drop a retired key. Tokens written with it can no longer be decrypted.
+        """
+        if key_id == self.primary_id:
+            raise ValueError("Cannot remove the primary key")
+        del self._keys[key_id]
+
+    def _parse(self, token) -> Tuple[Optional[str], memoryview]:
+        """
+        Split a raw token into (key ID, body), checking the keyring header is complete.
+        """
+        token = memoryview(token)
+        if token[:len(KEYRING_MAGIC)] != KEYRING_MAGIC:
+            return self.legacy_key_id, token
+        start = len(KEYRING_MAGIC) + 1
+        if len(token) < start or len(token) < start + token[start - 1]:
+            raise InvalidToken("Truncated keyring header")
+        end = start + token[start - 1]
+        try:
+            return bytes(token[start:end]).decode(), token[end:]
+        except UnicodeDecodeError:
+            raise InvalidToken("Malformed key ID in keyring header") from None
+
+    def key_id_of(self, token) -> Optional[str]:
+        """
+        Key ID a raw token was written with, or legacy_key_id if it has none.
+        """
+        return self._parse(token)[0]
+
+    def _split(self, token) -> Tuple[SymmetricKeyEncryption, memoryview]:
+        key_id, body = self._parse(token)
+        encryptor = self._keys.get(key_id)
+        if encryptor is None:
+            raise InvalidToken(f"No key registered for key ID {key_id!r}")
+        return encryptor, body
+
+    def encrypt_bytes(self, data) -> bytes:
+        if self.primary_id is None:
+            raise ValueError("KeyRing has no keys; add one with add_key or add_password before encrypting")
+        key_id = self.primary_id.encode()
+        header = KEYRING_MAGIC + bytes([len(key_id)]) + key_id
+        return header + self._keys[self.primary_id].encrypt_bytes(data)
+
+    def decrypt_bytes(self, token) -> bytes:
+        encryptor, body = self._split(token)
+        return encryptor.decrypt_bytes(body)
+
+    def encrypt_data(self, data: str) -> str:
+        return base64.urlsafe_b64encode(self.encrypt_bytes(data.encode())).decode()
+
+    def decrypt_data(self, encrypted_data: str) -> str:
+        return self.decrypt_bytes(base64.urlsafe_b64decode(encrypted_data)).decode()
+
+    def needs_rotation(self, encrypted_data: str) -> bool:
+        """
+        Whether a token was written with a key other than the primary one.
+        """
+        return self.key_id_of(base64.urlsafe_b64decode(encrypted_data)) != self.primary_id
+
+    def decrypt_and_rotate(self, encrypted_data: str) -> Tuple[str, Optional[str]]:
+        """
+        Decrypt a token and, if it is not under the primary key, re-encrypt it.
+
+        Returns (plaintext, new_token), where new_token is None when the token
+        is already current. Callers store new_token to migrate lazily on read.
+        """
+        token = base64.urlsafe_b64decode(encrypted_data)
+        plaintext = self.decrypt_bytes(token)
+        if self.key_id_of(token) == self.primary_id:
+            return plaintext.decode(), None
+        return plaintext.decode(), base64.urlsafe_b64encode(self.encrypt_bytes(plaintext)).decode()
+
+    def migrate(self, records: Iterable[Tuple[object, str]], store: Callable[[object, str], None]) -> MigrationProgress:
+        """
+        Re-encrypt stale tokens under the primary key in a background thread.
+
+        records yields (record_id, token) pairs and store(record_id, new_token)
+        is called for each token that was rotated. Decryption keeps working
+        for every key throughout, so no stop-the-world re-encrypt is needed.
+        """
+        progress = MigrationProgress()
+
+        def run():
+            try:
+                for record_id, token in records:
+                    progress.scanned += 1
+                    try:
+                        _, new_token = self.decrypt_and_rotate(token)
+                    except Exception:
+                        progress.failed += 1
+                        continue
+                    if new_token is not None:
+                        store(record_id, new_token)
+                        progress.rotated += 1
+            except Exception as e:
+                progress.error = e
+
+        progress._thread = threading.Thread(target=run, name='keyring-migration', daemon=True)
+        progress._thread.start()
+        return progress
+
+
+def _read_rows(path: str, fmt: str):
+    """
+    Yield rows from a JSONL or CSV file as dicts without loading it whole.
+    A JSONL line that is not valid JSON yields its JSONDecodeError.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        # Reported per row by process_batch_file instead of ending the read
+                        yield e
+
+
+class BatchFileReport:
+    """
+    Outcome of process_batch_file: rows written and the rows that failed.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        # (row number, error message) for rows whose field was missing or failed
+        self.errors = []
+
+    @property
+    def processed(self) -> int:
+        return self.rows - len(self.errors)
+
+
+def process_batch_file(encryptor: SymmetricKeyEncryption, operation: str, input_path: str, output_path: str,
+                       field: str, fmt: str = None, workers: int = None) -> BatchFileReport:
+    """
+    Encrypt or decrypt one field of every row in a JSONL/CSV file, writing the
+    rows in the same order and format. Rows stream through a single process
+    pool in blocks of BATCH_BLOCK_SIZE.
+
+    A row missing the field is written unchanged and one whose value fails
+    (e.g. a bad token) is written with the field emptied, so plaintext never
+    ends up in an encrypted file. JSONL lines that are not JSON objects are
+    left out of the output. All of them are listed in the report's errors.
+    Output goes to a temporary file that replaces output_path only when the
+    whole input has been processed.
+    """
+    fmt = fmt or ('csv' if input_path.lower().endswith('.csv') else 'jsonl')
+    method = encryptor.encrypt_many if operation == 'encrypt' else encryptor.decrypt_many
+    rows = _read_rows(input_path, fmt)
+    report = BatchFileReport()
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as out, encryptor.process_pool(workers) as pool:
+            writer = None
+            while True:
+                block = list(islice(rows, BATCH_BLOCK_SIZE))
+                if not block:
+                    break
+                unreadable = {}
+                for i, row in enumerate(block):
+                    if isinstance(row, json.JSONDecodeError):
+                        unreadable[i] = f"invalid JSON: {row}"
+                    elif not isinstance(row, dict):
+                        unreadable[i] = f"not a JSON object: {type(row).__name__}"
+                present = [i for i, row in enumerate(block) if i not in unreadable and row.get(field) is not None]
+                values = method([block[i][field] for i in present], executor=pool, return_exceptions=True)
+                for i, value in zip(present, values):
+                    if isinstance(value, Exception):
+                        block[i][field] = None
+                        report.errors.append((report.rows + i, f"{type(value).__name__}: {value}"))
+                    else:
+                        block[i][field] = value
+                missing = set(range(len(block))) - set(present) - unreadable.keys()
+                report.errors.extend((report.rows + i, f"missing field {field!r}") for i in sorted(missing))
+                report.errors.extend((report.rows + i, error) for i, error in unreadable.items())
+                readable = [row for i, row in enumerate(block) if i not in unreadable]
+                if fmt == 'csv':
+                    if writer is None:
+                        writer = csv.DictWriter(out, fieldnames=list(block[0].keys()))
+                        writer.writeheader()
+                    writer.writerows(readable)
+                else:
+                    out.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in readable)
+                report.rows += len(block)
+        report.errors.sort()
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return report
+
+
 def main():
     parser = argparse.ArgumentParser(description='Symmetric encryption/decryption tool')
-    parser.add_argument('operation', choices=['encrypt', 'decrypt'], 
-                       help='Operation to perform: encrypt or decrypt')
-    parser.add_argument('--data', '-d', required=True, 
+    parser.add_argument('operation', choices=['encrypt', 'decrypt', 'encrypt-file', 'decrypt-file', 'encrypt-batch', 'decrypt-batch'], 
+                       help='Operation to perform: encrypt, decrypt, encrypt-file, decrypt-file, encrypt-batch or decrypt-batch')
+    parser.add_argument('--data', '-d', 
                        help='Data to encrypt or encrypted data to decrypt')
+    parser.add_argument('--input', '-i', 
+                       help='Input file for file and batch operations')
+    parser.add_argument('--output', '-o', 
+                       help='Output file for file and batch operations')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f'Chunk size in bytes for encrypt-file (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--field', '-f', 
+                       help='JSONL key or CSV column to process for batch operations')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], 
+                       help='Batch file format (default: inferred from the input extension)')
+    parser.add_argument('--workers', '-w', type=int, 
+                       help='Worker processes for batch operations (default: CPU count)')
     parser.add_argument('--password', '-p', default="my_secure_password_123",
                        help='Password for key derivation (default: my_secure_password_123)')
     
     args = parser.parse_args()
+    if args.operation in ('encrypt', 'decrypt') and args.data is None:
+        parser.error(f"{args.operation} requires --data")
+    if args.operation not in ('encrypt', 'decrypt') and (args.input is None or args.output is None):
+        parser.error(f"{args.operation} requires --input and --output")
+    if args.operation in ('encrypt-batch', 'decrypt-batch') and args.field is None:
+        parser.error(f"{args.operation} requires --field")
     
     # Initialize encryptor with password
     encryptor = SymmetricKeyEncryption(args.password)
@@ -84,6 +730,31 @@ def main():
             print(f"Decrypted Data: {decrypted_result}")
         except Exception as e:
             print(f"Decryption failed: {e}")
+    
+    elif args.operation == 'encrypt-file':
+        try:
+            size = encryptor.encrypt_file(args.input, args.output, args.chunk_size)
+            print(f"Encrypted {size} bytes: {args.input} -> {args.output}")
+        except Exception as e:
+            print(f"Encryption failed: {e}")
+    
+    elif args.operation == 'decrypt-file':
+        try:
+            size = encryptor.decrypt_file(args.input, args.output)
+            print(f"Decrypted {size} bytes: {args.input} -> {args.output}")
+        except Exception as e:
+            print(f"Decryption failed: {e!r}")
+    
+    elif args.operation in ('encrypt-batch', 'decrypt-batch'):
+        try:
+            operation = args.operation.split('-')[0]
+            report = process_batch_file(encryptor, operation, args.input, args.output,
+                                        args.field, args.format, args.workers)
+            print(f"Processed {report.processed}/{report.rows} rows: {args.input} -> {args.output}")
+            for row, error in report.errors:
+                print(f"  row {row}: {error}")
+        except Exception as e:
+            print(f"Batch {operation} failed: {e!r}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from langchain_core.tools import BaseTool
+
+class ToolCache:
+    """LRU cache with an optional TTL (seconds) and hit/miss counters for one tool."""
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Return (found, value) for key, dropping the entry if it has expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if self.ttl is None or time.monotonic() - created_at <= self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+# Caches of every tool wrapped with cached_tool, keyed by "module.qualname" of
+# the wrapped function, so same-named tools in different modules stay separate
+_tool_caches: Dict[str, ToolCache] = {}
+
+def _qualified_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+def tool_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit rates and sizes of all cached tools in this process."""
+    return {name: cache.info() for name, cache in _tool_caches.items()}
+
+def clear_tool_caches():
+    for cache in _tool_caches.values():
+        cache.clear()
+
+def _make_key(signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """Canonical key for a call: arguments bound by name with defaults filled in."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return json.dumps(bound.arguments, sort_keys=True, default=repr)
+
+def _wrap(func: Callable, cache: ToolCache) -> Callable:
+    signature = inspect.signature(func)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            key = _make_key(signature, args, kwargs)
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = await func(*args, **kwargs)
+            cache.set(key, value)
+            return value
+        async_wrapper.cache = cache
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = _make_key(signature, args, kwargs)
+        found, value = cache.get(key)
+        if found:
+            return value
+        value = func(*args, **kwargs)
+        cache.set(key, value)
+        return value
+    wrapper.cache = cache
+    return wrapper
+
+def cached_tool(func=None, *, maxsize: int = 128, ttl: Optional[float] = None, cacheable: bool = True):
+    """
+    Memoize a deterministic or slowly changing tool on its normalized arguments.
+
+    Works below @tool on the plain function:
+
+        @tool
+        @cached_tool(ttl=300)
+        def get_weather(location: str) -> str: ...
+
+    or above it on an existing tool (@cached_tool placed over @tool). Results
+    are cached per tool with LRU eviction at maxsize and expire after ttl
+    seconds (never when None). Exceptions are not cached. cacheable=False
+    leaves the tool untouched, so caching can be switched off per tool.
+    """
+    def decorate(target):
+        if not cacheable:
+            return target
+        # A fresh cache per decoration: re-decorating (e.g. on module reload) starts empty
+        cache = ToolCache(maxsize, ttl)
+        if isinstance(target, BaseTool):
+            wrapped = getattr(target, "func", None) or getattr(target, "coroutine", None)
+            _tool_caches[_qualified_name(wrapped) if wrapped is not None else target.name] = cache
+            if getattr(target, "func", None) is not None:
+                target.func = _wrap(target.func, cache)
+            if getattr(target, "coroutine", None) is not None:
+                target.coroutine = _wrap(target.coroutine, cache)
+            return target
+        _tool_caches[_qualified_name(target)] = cache
+        return _wrap(target, cache)
+
+    return decorate if func is None else decorate(func)
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Union
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import BaseTool
+
+class ToolExecutor:
+    """
+    Dispatches the tool calls of an AI message to their tools by name.
+
+    Independent calls run concurrently: sync tools on a thread pool and async
+    tools through asyncio.gather. Each call may have a timeout, and results
+    come back as ToolMessages in the same order as the calls, so total latency
+    is the slowest call rather than the sum of all of them.
+    """
+
+    def __init__(self, tools: List[BaseTool], max_workers: int = 8,
+                 timeout: Optional[float] = None, timeouts: Optional[Dict[str, float]] = None):
+        self.tools = {tool.name: tool for tool in tools}
+        self.timeout = timeout
+        # Per-tool overrides of the default timeout, keyed by tool name
+        self.timeouts = timeouts or {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def _timeout_for(self, name: str) -> Optional[float]:
+        return self.timeouts.get(name, self.timeout)
+
+    @staticmethod
+    def _tool_calls(calls: Union[AIMessage, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return calls.tool_calls if isinstance(calls, AIMessage) else list(calls)
+
+    @staticmethod
+    def _is_async(tool: BaseTool) -> bool:
+        if hasattr(tool, "func"):
+            # StructuredTool/Tool: async only when built from a coroutine (their _arun
+            # override otherwise just runs func on asyncio's default executor)
+            return getattr(tool, "coroutine", None) is not None
+        # Custom BaseTool subclass: async when it implements _arun
+        return type(tool)._arun is not BaseTool._arun
+
+    @staticmethod
+    def _message(tool_call: Dict[str, Any], content: Any, status: str = "success") -> ToolMessage:
+        return ToolMessage(
+            content=str(content),
+            tool_call_id=tool_call["id"],
+            name=tool_call["name"],
+            status=status,
+        )
+
+    def _run_sync(self, tool: BaseTool, args: Dict[str, Any]):
+        if self._is_async(tool) and getattr(tool, "func", None) is None:
+            # Async-only tool called from the sync path: give it its own loop
+            return asyncio.run(tool.ainvoke(args))
+        return tool.invoke(args)
+
+    def execute(self, calls: Union[AIMessage, List[Dict[str, Any]]]) -> List[ToolMessage]:
+        """Run all tool calls concurrently on the thread pool and return ToolMessages in call order."""
+        tool_calls = self._tool_calls(calls)
+        start = time.monotonic()
+        futures = []
+        for tool_call in tool_calls:
+            tool = self.tools.get(tool_call["name"])
+            futures.append(None if tool is None else self._pool.submit(self._run_sync, tool, tool_call["args"]))
+
+        messages = []
+        for tool_call, future in zip(tool_calls, futures):
+            if future is None:
+                messages.append(self._message(tool_call, f"Error: unknown tool '{tool_call['name']}'", "error"))
+                continue
+            timeout = self._timeout_for(tool_call["name"])
+            # All calls started together, so each timeout counts from the batch start
+            remaining = None if timeout is None else max(0.0, start + timeout - time.monotonic())
+            try:
+                messages.append(self._message(tool_call, future.result(timeout=remaining)))
+            except FutureTimeoutError:
+                future.cancel()
+                messages.append(self._message(tool_call, f"Error: tool '{tool_call['name']}' timed out after {timeout}s", "error"))
+            except Exception as e:
+                messages.append(self._message(tool_call, f"Error: {e}", "error"))
+        return messages
+
+    async def _arun_one(self, tool_call: Dict[str, Any]) -> ToolMessage:
+        tool = self.tools.get(tool_call["name"])
+        if tool is None:
+            return self._message(tool_call, f"Error: unknown tool '{tool_call['name']}'", "error")
+
+        if self._is_async(tool):
+            awaitable = tool.ainvoke(tool_call["args"])
+        else:
+            loop = asyncio.get_running_loop()
+            awaitable = loop.run_in_executor(self._pool, tool.invoke, tool_call["args"])
+
+        timeout = self._timeout_for(tool_call["name"])
+        try:
+            return self._message(tool_call, await asyncio.wait_for(awaitable, timeout))
+        except asyncio.TimeoutError:
+            return self._message(tool_call, f"Error: tool '{tool_call['name']}' timed out after {timeout}s", "error")
+        except Exception as e:
+            return self._message(tool_call, f"Error: {e}", "error")
+
+    async def aexecute(self, calls: Union[AIMessage, List[Dict[str, Any]]]) -> List[ToolMessage]:
+        """Run all tool calls concurrently with asyncio.gather and return ToolMessages in call order."""
+        return list(await asyncio.gather(*(self._arun_one(tool_call) for tool_call in self._tool_calls(calls))))
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "ToolExecutor":
+        return self
+
+    def __exit__(self, *exc_info):
+        # Don't wait for calls that already timed out; queued ones are dropped
+        self._pool.shutdown(wait=False, cancel_futures=True)
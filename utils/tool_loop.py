@@ -0,0 +1,71 @@
+from typing import Any, Callable, List, Literal, Optional
+from pydantic import BaseModel, Field
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, message_chunk_to_message
+from utils.tool_executor import ToolExecutor
+
+class ToolLoopResult(BaseModel):
+    messages: List[BaseMessage] = Field(description="Full conversation including tool results")
+    final_message: Optional[AIMessage] = Field(default=None, description="Last assistant message")
+    steps: int = Field(description="Number of model invocations")
+    stop_reason: Literal["final_answer", "max_steps"] = Field(description="Why the loop stopped")
+
+    @property
+    def output(self) -> str:
+        return _text(self.final_message.content) if self.final_message else ""
+
+def _text(content: Any) -> str:
+    """Plain text of a message content, which may be a list of content blocks"""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content:
+        if isinstance(block, str):
+            parts.append(block)
+        elif isinstance(block, dict) and block.get("type") == "text":
+            parts.append(block.get("text", ""))
+    return "".join(parts)
+
+def _merge(chunk: Optional[AIMessageChunk], delta: AIMessageChunk, on_token) -> AIMessageChunk:
+    if on_token is not None:
+        text = _text(delta.content)
+        if text:
+            on_token(text)
+    return delta if chunk is None else chunk + delta
+
+def run_tool_loop(llm_with_tools, messages: List[BaseMessage], executor: ToolExecutor,
+                  max_steps: int = 5, on_token: Optional[Callable[[str], None]] = None) -> ToolLoopResult:
+    """
+    Drive a tool-bound model until it gives a final answer or max_steps runs out.
+
+    Each step streams the assistant reply, passing text deltas to on_token as
+    they arrive, then runs any tool calls through executor and sends the
+    ToolMessages back to the model. messages is not modified.
+    """
+    messages = list(messages)
+    final_message = None
+    for step in range(1, max_steps + 1):
+        chunk = None
+        for delta in llm_with_tools.stream(messages):
+            chunk = _merge(chunk, delta, on_token)
+        final_message = message_chunk_to_message(chunk) if chunk is not None else AIMessage(content="")
+        messages.append(final_message)
+        if not final_message.tool_calls:
+            return ToolLoopResult(messages=messages, final_message=final_message, steps=step, stop_reason="final_answer")
+        messages.extend(executor.execute(final_message))
+    return ToolLoopResult(messages=messages, final_message=final_message, steps=max_steps, stop_reason="max_steps")
+
+async def arun_tool_loop(llm_with_tools, messages: List[BaseMessage], executor: ToolExecutor,
+                         max_steps: int = 5, on_token: Optional[Callable[[str], None]] = None) -> ToolLoopResult:
+    """Async variant of run_tool_loop using astream and ToolExecutor.aexecute."""
+    messages = list(messages)
+    final_message = None
+    for step in range(1, max_steps + 1):
+        chunk = None
+        async for delta in llm_with_tools.astream(messages):
+            chunk = _merge(chunk, delta, on_token)
+        final_message = message_chunk_to_message(chunk) if chunk is not None else AIMessage(content="")
+        messages.append(final_message)
+        if not final_message.tool_calls:
+            return ToolLoopResult(messages=messages, final_message=final_message, steps=step, stop_reason="final_answer")
+        messages.extend(await executor.aexecute(final_message))
+    return ToolLoopResult(messages=messages, final_message=final_message, steps=max_steps, stop_reason="max_steps")
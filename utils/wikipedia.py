@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import quote
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_BASE_URL = "https://en.wikipedia.org/api/rest_v1"
+DEFAULT_CACHE_PATH = os.path.join(".cache", "wikipedia.sqlite")
+USER_AGENT = "langchain_examples/0.1 (https://github.com/WeiZhou365/langchain_examples)"
+
+class WikipediaClient:
+    """
+    Page summary lookups over one pooled keep-alive session.
+
+    Requests time out instead of hanging, transient failures are retried with
+    exponential backoff, and found summaries are kept in an on-disk SQLite
+    cache so repeated lookups skip the network entirely. base_url can point
+    at a local stand-in server for tests.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, timeout: float = 10.0, retries: int = 3,
+                 backoff_factor: float = 0.5, pool_size: int = 10,
+                 cache_path: Optional[str] = DEFAULT_CACHE_PATH, cache_ttl: Optional[float] = 7 * 24 * 3600):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        if cache_path:
+            directory = os.path.dirname(cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summary ("
+                "url TEXT PRIMARY KEY, title TEXT, extract TEXT, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def summary_url(self, query: str) -> str:
+        # Page titles use underscores for spaces; everything else is percent-escaped
+        return f"{self.base_url}/page/summary/{quote(query.strip().replace(' ', '_'), safe='')}"
+
+    def _cached(self, url: str) -> Optional[Dict[str, str]]:
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT title, extract, created_at FROM summary WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        title, extract, created_at = row
+        if self.cache_ttl is not None and time.time() - created_at > self.cache_ttl:
+            return None
+        return {"title": title, "extract": extract}
+
+    def _store(self, url: str, summary: Dict[str, str]):
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summary (url, title, extract, created_at) VALUES (?, ?, ?, ?)",
+                (url, summary["title"], summary["extract"], time.time()),
+            )
+            self._conn.commit()
+
+    def summary(self, query: str) -> Optional[Dict[str, str]]:
+        """
+        Return {"title", "extract"} for the page matching query, or None if
+        there is no such page. Network errors propagate as requests exceptions.
+        """
+        url = self.summary_url(query)
+        cached = self._cached(url)
+        if cached is not None:
+            return cached
+
+        response = self.session.get(url, timeout=self.timeout)
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        summary = {
+            "title": data.get("title", "N/A"),
+            "extract": data.get("extract", "No summary available"),
+        }
+        self._store(url, summary)
+        return summary
+
+    def close(self):
+        self.session.close()
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_wikipedia_client() -> WikipediaClient:
+    """Process-wide client; WIKIPEDIA_BASE_URL overrides the API endpoint."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = WikipediaClient(base_url=os.getenv("WIKIPEDIA_BASE_URL", DEFAULT_BASE_URL))
+    return _client
+
+def set_wikipedia_client(client: Optional[WikipediaClient]):
+    """Replace the process-wide client, e.g. with one pointed at a local server."""
+    global _client
+    with _client_lock:
+        _client = client